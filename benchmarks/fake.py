@@ -0,0 +1,94 @@
+"""
+An in-process stand-in for asyncpg connections, used to benchmark without a database.
+
+Notifications published through a FakeConnection are delivered to the listeners of
+every connection opened on the same FakeServer, the way asyncpg delivers them: each
+async callback runs in its own task.
+"""
+
+import asyncio
+import os
+
+
+class FakeServer:
+    """
+    Routes notifications between the FakeConnections opened on it.
+    """
+
+    def __init__(self):
+        self.connections = []
+        self.tasks = set()
+
+    def connect(self):
+        """
+        Returns a new FakeConnection attached to this server.
+        """
+        conn = FakeConnection(self)
+        self.connections.append(conn)
+        return conn
+
+    def publish(self, channel: str, payload: str):
+        loop = asyncio.get_running_loop()
+        pid = os.getpid()
+        for conn in self.connections:
+            for callback in conn.listeners.get(channel, ()):
+                task = loop.create_task(callback(conn, pid, channel, payload))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def drain(self):
+        """
+        Waits until every delivered notification has been handled.
+        """
+        while self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+class _FakeStatement:
+    def __init__(self, server):
+        self._server = server
+
+    async def fetchval(self, channel, payload):
+        self._server.publish(channel, payload)
+
+
+class FakeConnection:
+    """
+    Implements the subset of asyncpg.Connection used by Notifier and Listener.
+    """
+
+    def __init__(self, server: FakeServer):
+        self._server = server
+        self.listeners = {}
+        self._closed = False
+
+    async def prepare(self, query):
+        return _FakeStatement(self._server)
+
+    async def fetchval(self, query, channel, payload):
+        self._server.publish(channel, payload)
+
+    async def execute(self, query, channels=(), payloads=()):
+        for channel, payload in zip(channels, payloads):
+            self._server.publish(channel, payload)
+
+    async def fetch(self, query, *args):
+        return []
+
+    async def add_listener(self, channel, callback):
+        self.listeners.setdefault(channel, []).append(callback)
+
+    async def remove_listener(self, channel, callback):
+        callbacks = self.listeners.get(channel, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def add_termination_listener(self, callback):
+        pass
+
+    def is_closed(self):
+        return self._closed
+
+    async def close(self):
+        self._closed = True
+        self.listeners = {}
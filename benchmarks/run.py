@@ -0,0 +1,209 @@
+"""
+Benchmarks publish throughput, dispatch overhead, delivery latency and queue memory.
+
+Usage:
+    python benchmarks/run.py                               # in-process fake connection
+    python benchmarks/run.py --dsn postgresql://localhost/bench
+    python benchmarks/run.py --output new.json --compare old.json
+
+Results are printed and, with --output, written as JSON so that runs of different
+versions can be compared with --compare.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_pg_notify import Dispatcher, Listener, Notification, Notifier, PGConfig, __version__
+from fake import FakeServer
+
+CHANNEL = "pg_notify_bench"
+TABLE = "pg_notify_bench"
+PAYLOAD = '{"id": 1, "name": "benchmark", "value": "' + "x" * 64 + '"}'
+
+
+async def _open(manager, server):
+    if server is None:
+        await manager.connect()
+    else:
+        manager.conn = server.connect()
+    return manager
+
+
+def _rate(count, elapsed):
+    return {"messages": count, "seconds": elapsed, "per_second": count / elapsed}
+
+
+def _percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100)
+    return {
+        "samples": len(samples),
+        "p50_ms": cuts[49] * 1000,
+        "p90_ms": cuts[89] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+async def bench_notify(config, server, count):
+    notifier = await _open(Notifier(config), server)
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            await notifier.notify(CHANNEL, PAYLOAD)
+        return _rate(count, time.perf_counter() - start)
+    finally:
+        await notifier.close()
+
+
+async def bench_notify_many(config, server, count, batch_size=1000):
+    notifier = await _open(Notifier(config), server)
+    try:
+        start = time.perf_counter()
+        await notifier.notify_many(((CHANNEL, PAYLOAD) for _ in range(count)), batch_size)
+        return {**_rate(count, time.perf_counter() - start), "batch_size": batch_size}
+    finally:
+        await notifier.close()
+
+
+async def bench_dispatch(config, server, count, **listener_kwargs):
+    # Feeds the registered callback directly, isolating the Listener's own overhead
+    listener = Listener(config)
+    listener.conn = (server or FakeServer()).connect()
+    received = 0
+
+    async def handler(notification):
+        nonlocal received
+        received += 1
+
+    try:
+        await listener.add_listener(CHANNEL, handler, **listener_kwargs)
+        callback = listener.listeners[CHANNEL]
+        start = time.perf_counter()
+        for _ in range(count):
+            await callback(listener.conn, 0, CHANNEL, PAYLOAD)
+        if CHANNEL in listener.dispatchers:
+            await listener.dispatchers[CHANNEL].join()
+        elapsed = time.perf_counter() - start
+        assert received == count
+        return {**_rate(count, elapsed), "us_per_message": elapsed / count * 1e6}
+    finally:
+        await listener.close()
+
+
+async def bench_latency(config, server, count):
+    notifier = await _open(Notifier(config), server)
+    listener = await _open(Listener(config), server)
+    received = asyncio.Event()
+
+    async def handler(notification):
+        received.set()
+
+    try:
+        if server is None:
+            await notifier.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (id serial, value text);")
+            await notifier.create_trigger_function(f"{TABLE}_fn", CHANNEL)
+            await notifier.create_trigger(TABLE, f"{TABLE}_trigger", f"{TABLE}_fn", "INSERT")
+        await listener.add_listener(CHANNEL, handler)
+
+        samples = []
+        for i in range(count):
+            received.clear()
+            start = time.perf_counter()
+            if server is None:
+                await notifier.execute(f"INSERT INTO {TABLE} (value) VALUES ($1);", str(i))
+            else:
+                await notifier.notify(CHANNEL, PAYLOAD)
+            await asyncio.wait_for(received.wait(), 10)
+            samples.append(time.perf_counter() - start)
+        return _percentiles(samples)
+    finally:
+        await listener.close()
+        if server is None:
+            await notifier.execute(f"DROP TABLE IF EXISTS {TABLE};")
+            await notifier.execute(f"DROP FUNCTION IF EXISTS {TABLE}_fn() CASCADE;")
+        await notifier.close()
+
+
+async def bench_queue_memory(count):
+    dispatcher = Dispatcher(None, queue_size=count)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            # Fresh payload strings, as received from the server
+            payload = PAYLOAD.replace("1", str(i), 1)
+            await dispatcher.put(Notification(None, 0, CHANNEL, payload))
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "notifications": count,
+        "payload_bytes": len(PAYLOAD),
+        "bytes_per_notification": used / count,
+    }
+
+
+async def run(args):
+    server = None if args.dsn else FakeServer()
+    config = PGConfig(args.dsn or "postgresql://fake/fake")
+    count = args.count
+
+    results = {
+        "notify": await bench_notify(config, server, count),
+        "notify_many": await bench_notify_many(config, server, count),
+        "dispatch_direct": await bench_dispatch(config, server, count),
+        "dispatch_queue": await bench_dispatch(config, server, count, queue_size=1000),
+        "latency": await bench_latency(config, server, args.latency_count),
+        "queue_memory": await bench_queue_memory(count),
+    }
+    return {
+        "version": __version__,
+        "backend": "postgres" if args.dsn else "fake",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    """
+    Prints each numeric result next to its baseline value and their ratio.
+    """
+    for name, values in report["results"].items():
+        for key, value in values.items():
+            old = baseline.get("results", {}).get(name, {}).get(key)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                print(f"{name}.{key}: {old:.6g} -> {value:.6g} ({value / old:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", help="Benchmark against this database instead of a fake connection.")
+    parser.add_argument("--count", type=int, default=20000, help="Messages per throughput run.")
+    parser.add_argument("--latency-count", type=int, default=1000, help="Latency samples.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with the results in this JSON file.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import asyncio
-import json
 from dotenv import load_dotenv
 from py_pg_notify import Listener, Notification, PGConfig
 
@@ -11,8 +10,8 @@ async def notification_handler(msg: Notification):
     Processes the received notification with a detailed payload.
     """
     try:
-        # Parse the JSON payload
-        payload = json.loads(msg.payload)
+        # The JSON payload is decoded on first access
+        payload = msg.json
 
         trigger_name = payload.get("trigger")
         event = payload.get("event")
@@ -36,7 +35,7 @@ async def notification_handler(msg: Notification):
                 f"✅ Stock levels for Product ID {product_id} ('{product_name}') are sufficient."
             )
 
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Error decoding JSON payload: {e}")
     except Exception as e:
         print(f"Error processing notification: {e}")
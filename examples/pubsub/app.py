@@ -16,6 +16,7 @@ async def pubsub():
         message = f"Message #{i} - py-pg-notify PubSub example"
         await publisher.publish(channel='Channel_1', msg=message)
         await asyncio.sleep(1)
+    await publisher.close()
     await subs.close()
     print(f"{Fore.BLUE}[Subscriber]{Style.RESET_ALL} Subscription closed.")
 
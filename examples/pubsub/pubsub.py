@@ -7,13 +7,17 @@ class Pub:
 
     def __init__(self, config: PGConfig):
         self.config = config
+        self.publisher = Notifier(config)
 
     async def publish(self, channel: str, msg: str):
         try:
-            async with Notifier(self.config) as publisher:
-                await publisher.notify(channel, msg)
+            await self.publisher.connect()  # No-op once connected
+            await self.publisher.notify(channel, msg)
         except Exception as e:
             raise e
+
+    async def close(self):
+        await self.publisher.close()
         
 
 class Sub:
@@ -1,5 +1,10 @@
 from .pgmanager import PGConfig, PGManager
 from .listener import Listener, Notification
 from .notifier import Notifier
+from .dispatcher import Batcher, Coalescer, Dispatcher, ExecutorDispatcher
+from .router import Router
+from .metrics import Metrics, PrometheusMetrics
+from .compression import Compressor
+from .serializers import JSONSerializer, MsgpackSerializer, OrjsonSerializer, Serializer
 
 __version__ = "1.0.2"
@@ -0,0 +1,107 @@
+"""
+Module to compress notification payloads into text that fits more data into NOTIFY.
+"""
+
+import base64
+import zlib
+
+# Starts a compressed payload, followed by the algorithm name and ":"
+COMPRESSION_MARK = "\x1d"
+
+ALGORITHMS = ("zlib", "zstd")
+
+
+def _zstd():
+    # zstandard is optional; only required when zstd payloads are sent or received
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package: pip install py-pg-notify[zstd]"
+        )
+    return zstandard
+
+
+def _compress(algorithm, data, level):
+    if algorithm == "zlib":
+        return zlib.compress(data, -1 if level is None else level)
+    return _zstd().ZstdCompressor(level=3 if level is None else level).compress(data)
+
+
+def _decompress(algorithm, data):
+    if algorithm == "zlib":
+        return zlib.decompress(data)
+    if algorithm == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown compression algorithm '{algorithm}'")
+
+
+class Compressor:
+    """
+    Compresses payloads above a size threshold.
+
+    A compressed payload is the COMPRESSION_MARK, the algorithm name, ":" and the
+    base64-encoded compressed bytes, so it remains valid NOTIFY text. Payloads below
+    the threshold, and payloads that would not get smaller, are sent unchanged.
+    """
+
+    def __init__(self, algorithm: str = "zlib", threshold: int = 1024, level: int = None):
+        """
+        Initializes the Compressor class.
+
+        Args:
+            algorithm (str, optional): "zlib", or "zstd" which requires the zstandard
+                package. Defaults to "zlib".
+            threshold (int, optional): The smallest payload, in bytes, that is compressed.
+                Defaults to 1024.
+            level (int, optional): The compression level. Defaults to the algorithm's default.
+
+        Raises:
+            ValueError: If the algorithm is unknown or the threshold is negative.
+            ImportError: If zstd is selected and zstandard is not installed.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {', '.join(repr(a) for a in ALGORITHMS)}")
+        if threshold < 0:
+            raise ValueError("threshold must not be negative")
+        if algorithm == "zstd":
+            _zstd()
+
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = level
+        self._header = f"{COMPRESSION_MARK}{algorithm}:"
+
+    def compress(self, payload: str) -> str:
+        """
+        Returns the payload, compressed if that makes it smaller.
+
+        Args:
+            payload (str): The notification payload.
+        """
+        data = payload.encode()
+        if len(data) < self.threshold:
+            return payload
+        packed = base64.b64encode(_compress(self.algorithm, data, self.level)).decode("ascii")
+        if len(self._header) + len(packed) >= len(data):
+            return payload
+        return self._header + packed
+
+
+def decompress(payload: str) -> str:
+    """
+    Returns the original text of a payload compressed by a Compressor.
+
+    Payloads without the compression header are returned unchanged.
+
+    Args:
+        payload (str): The notification payload.
+
+    Raises:
+        ValueError: If the header names an unknown algorithm.
+        ImportError: If the payload uses zstd and zstandard is not installed.
+    """
+    if not payload.startswith(COMPRESSION_MARK):
+        return payload
+    algorithm, _, packed = payload[1:].partition(":")
+    return _decompress(algorithm, base64.b64decode(packed)).decode()
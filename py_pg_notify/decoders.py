@@ -0,0 +1,26 @@
+"""
+Module to select the JSON decoder used for notification payloads.
+"""
+
+import json
+from typing import Callable
+
+
+def _fastest_json_decoder() -> Callable:
+    # orjson and msgspec are optional; fall back to the standard library
+    try:
+        import orjson
+
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        return msgspec.json.decode
+    except ImportError:
+        pass
+    return json.loads
+
+
+DEFAULT_JSON_DECODER = _fastest_json_decoder()
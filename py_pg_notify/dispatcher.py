@@ -0,0 +1,521 @@
+"""
+Module to dispatch notifications to handlers through a bounded queue.
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import Callable
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+def validate_overflow(overflow: str):
+    """
+    Raises a ValueError if `overflow` is not a known overflow policy.
+    """
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"overflow must be one of {', '.join(repr(p) for p in OVERFLOW_POLICIES)}"
+        )
+
+
+async def put_with_overflow(queue: asyncio.Queue, item, overflow: str):
+    """
+    Puts an item on a bounded queue, applying the overflow policy if it is full.
+
+    Args:
+        queue (asyncio.Queue): The queue to put the item on.
+        item: The item to queue.
+        overflow (str): "block", "drop_oldest" or "drop_newest".
+
+    Returns:
+        bool: False if an item was dropped to honour the policy, otherwise True.
+    """
+    if overflow == "block":
+        await queue.put(item)
+        return True
+
+    if not queue.full():
+        queue.put_nowait(item)
+        return True
+    if overflow == "drop_newest":
+        return False
+    queue.get_nowait()
+    queue.task_done()
+    queue.put_nowait(item)
+    return False
+
+
+def is_async_callable(callback: Callable):
+    """
+    Returns True if calling `callback` returns an awaitable coroutine.
+    """
+    return inspect.iscoroutinefunction(callback) or inspect.iscoroutinefunction(
+        getattr(type(callback), "__call__", None)
+    )
+
+
+def run_in_executor(callback: Callable, executor: Executor = None):
+    """
+    Wraps a synchronous callback into an async function that calls it in an executor.
+
+    Functions that are not declared `async def` may still return an awaitable, such
+    as a lambda wrapping a coroutine function; such a result is awaited on the loop.
+
+    Args:
+        callback (callable): The synchronous function to wrap.
+        executor (Executor, optional): The executor running the calls. Defaults to the
+            event loop's default executor.
+
+    Returns:
+        callable: An async function taking the same single argument as `callback`.
+    """
+
+    async def _call(item):
+        result = await asyncio.get_running_loop().run_in_executor(executor, callback, item)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    return _call
+
+
+def report_callback_error(error: Exception):
+    """
+    Passes an exception raised by a handler to the event loop's exception handler.
+    """
+    asyncio.get_running_loop().call_exception_handler(
+        {
+            "message": f"Unhandled exception in notification callback: {error}",
+            "exception": error,
+        }
+    )
+
+
+class Dispatcher:
+    """
+    Delivers notifications to a callback from a bounded queue served by worker tasks.
+
+    Key Features:
+    - Bounded queue: at most `queue_size` notifications wait for a worker.
+    - Concurrency limit: at most `workers` callbacks run at the same time.
+    - Overflow policy applied when the queue is full:
+        - "block": wait for free space. asyncpg delivers every notification in a task
+          of its own, so this does not slow the server down: notifications arriving
+          while the queue is full wait in pending tasks, and memory grows with the burst.
+        - "drop_oldest": discard the oldest queued notification to make room.
+        - "drop_newest": discard the incoming notification.
+
+    Only the drop policies bound memory during a burst.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        queue_size: int = 1000,
+        workers: int = 1,
+        overflow: str = "block",
+    ):
+        """
+        Initializes the Dispatcher class.
+
+        Args:
+            callback (callable): An async function called with each queued item.
+            queue_size (int, optional): The maximum number of queued items. Defaults to 1000.
+            workers (int, optional): The number of worker tasks. Defaults to 1.
+            overflow (str, optional): The overflow policy. Defaults to "block".
+
+        Raises:
+            ValueError: If an argument is out of range or the overflow policy is unknown.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be a positive integer")
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        validate_overflow(overflow)
+
+        self.callback = callback
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.overflow = overflow
+        self.dropped = 0
+        self._tasks = []
+
+    @property
+    def depth(self):
+        """
+        int: The number of items waiting for a worker.
+        """
+        return self.queue.qsize()
+
+    def start(self):
+        """
+        Starts the worker tasks. Calling it again while running has no effect.
+        """
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
+
+    async def put(self, item):
+        """
+        Queues an item for delivery, applying the overflow policy if the queue is full.
+
+        Args:
+            item: The item to pass to the callback.
+
+        Returns:
+            bool: False if an item was dropped to honour the overflow policy, otherwise True.
+        """
+        accepted = await put_with_overflow(self.queue, item, self.overflow)
+        if not accepted:
+            self.dropped += 1
+        return accepted
+
+    async def join(self):
+        """
+        Waits until every queued item has been processed.
+        """
+        await self.queue.join()
+
+    async def stop(self):
+        """
+        Cancels the worker tasks. Items still queued are discarded.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self.callback(item)
+            except Exception as e:
+                report_callback_error(e)
+            finally:
+                self.queue.task_done()
+
+
+class Batcher:
+    """
+    Delivers notifications to a callback in lists.
+
+    A batch is delivered when it holds `max_batch` items or when `max_delay` seconds
+    have passed since its first item arrived, whichever comes first. Batches are
+    delivered one at a time and in arrival order.
+    """
+
+    def __init__(self, callback: Callable, max_batch: int = 100, max_delay: float = 0.1):
+        """
+        Initializes the Batcher class.
+
+        Args:
+            callback (callable): An async function called with each list of items.
+            max_batch (int, optional): The maximum number of items per batch. Defaults to 100.
+            max_delay (float, optional): The maximum seconds an item waits for its batch
+                to fill. Defaults to 0.1.
+
+        Raises:
+            ValueError: If an argument is out of range.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be a positive integer")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+
+        self.callback = callback
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._batch = []
+        self._timer = None
+        self._lock = asyncio.Lock()
+        self._tasks = set()
+
+    @property
+    def depth(self):
+        """
+        int: The number of items waiting in the current batch.
+        """
+        return len(self._batch)
+
+    def start(self):
+        """
+        Present for interface parity with Dispatcher; batches need no worker tasks.
+        """
+
+    async def put(self, item):
+        """
+        Adds an item to the current batch, delivering the batch once it is full.
+
+        Args:
+            item: The item to add.
+        """
+        self._batch.append(item)
+        if len(self._batch) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush_later
+            )
+
+    async def flush(self):
+        """
+        Delivers the current batch, if it holds any items.
+
+        The delivery runs in a task of its own, so cancelling the caller waiting for
+        it does not interrupt the delivery of the other items in the batch.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._deliver(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        await asyncio.shield(task)
+
+    async def _deliver(self, batch):
+        async with self._lock:
+            try:
+                await self.callback(batch)
+            except Exception as e:
+                report_callback_error(e)
+
+    async def stop(self):
+        """
+        Delivers the pending batch and waits for deliveries in progress.
+        """
+        await self.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush_later(self):
+        self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+class Coalescer:
+    """
+    Delivers only the latest item per key within a time window.
+
+    The first item to arrive opens a window of `window` seconds. Items arriving in
+    the window replace earlier items with the same key, and when it closes the
+    surviving items are delivered one at a time, in the order their keys first
+    appeared. Items whose key cannot be computed are delivered immediately.
+    """
+
+    def __init__(self, callback: Callable, key: Callable, window: float = 0.1):
+        """
+        Initializes the Coalescer class.
+
+        Args:
+            callback (callable): An async function called with each surviving item.
+            key (callable): A function returning the coalescing key of an item.
+            window (float, optional): The seconds items are held before delivery.
+                Defaults to 0.1.
+
+        Raises:
+            ValueError: If window is negative.
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+
+        self.callback = callback
+        self.key = key
+        self.window = window
+        self.coalesced = 0
+        self._pending = {}
+        self._timer = None
+        self._lock = asyncio.Lock()
+        self._tasks = set()
+
+    @property
+    def depth(self):
+        """
+        int: The number of items waiting for the window to close.
+        """
+        return len(self._pending)
+
+    def start(self):
+        """
+        Present for interface parity with Dispatcher; coalescing needs no worker tasks.
+        """
+
+    async def put(self, item):
+        """
+        Holds an item until the window closes, replacing a held item with the same key.
+
+        Args:
+            item: The item to hold.
+        """
+        try:
+            key = self.key(item)
+            superseded = key in self._pending
+        except Exception:
+            await self._deliver([item])
+            return
+
+        if superseded:
+            self.coalesced += 1
+        self._pending[key] = item
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush_later
+            )
+
+    async def flush(self):
+        """
+        Delivers the held items without waiting for the window to close.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        await self._deliver(pending.values())
+
+    async def stop(self):
+        """
+        Delivers the held items and waits for deliveries in progress.
+        """
+        await self.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _deliver(self, items):
+        async with self._lock:
+            for item in items:
+                try:
+                    await self.callback(item)
+                except Exception as e:
+                    report_callback_error(e)
+
+    def _flush_later(self):
+        self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+class ExecutorDispatcher:
+    """
+    Runs a synchronous callback for each item in a concurrent.futures executor.
+
+    At most `max_pending` items are submitted and not yet completed; `put` waits for
+    a free slot beyond that, in the task asyncpg created for the notification, so
+    waiting notifications still hold memory. The return
+    value of each call is passed to `result_callback`, and exceptions are reported to
+    the event loop's exception handler. With `ordered` completions are handled in
+    submission order, otherwise as soon as each call finishes.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        executor: Executor,
+        max_pending: int = 1000,
+        ordered: bool = True,
+        result_callback: Callable = None,
+        shutdown: bool = False,
+    ):
+        """
+        Initializes the ExecutorDispatcher class.
+
+        Args:
+            callback (callable): A synchronous function called with each item in the executor.
+            executor (Executor): The executor running the callback.
+            max_pending (int, optional): The maximum number of submitted items not yet
+                completed. Defaults to 1000.
+            ordered (bool, optional): If True, completions are handled in submission order.
+                Defaults to True.
+            result_callback (callable, optional): An async function called with the return
+                value of each call.
+            shutdown (bool, optional): If True, the executor is shut down by `stop()`.
+                Defaults to False.
+
+        Raises:
+            ValueError: If max_pending is out of range.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be a positive integer")
+
+        self.callback = callback
+        self.executor = executor
+        self.max_pending = max_pending
+        self.ordered = ordered
+        self.result_callback = result_callback
+        self.shutdown = shutdown
+        self.pending = 0
+        self._slots = asyncio.Semaphore(max_pending)
+        self._completions = asyncio.Queue()
+        self._task = None
+        self._tasks = set()
+
+    @property
+    def depth(self):
+        """
+        int: The number of items submitted to the executor and not yet completed.
+        """
+        return self.pending
+
+    def start(self):
+        """
+        Starts the task handling completions in order. Calling it again has no effect.
+        """
+        if self.ordered and self._task is None:
+            self._task = asyncio.create_task(self._complete_in_order())
+
+    async def put(self, item):
+        """
+        Submits an item to the executor, waiting while `max_pending` items are in flight.
+
+        Args:
+            item: The item to pass to the callback.
+        """
+        await self._slots.acquire()
+        self.pending += 1
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, self.callback, item
+        )
+        if self.ordered:
+            self._completions.put_nowait(future)
+        else:
+            task = asyncio.create_task(self._complete(future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def stop(self):
+        """
+        Cancels the calls that have not started and stops handling completions.
+        """
+        if self._task is not None:
+            self._task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        while not self._completions.empty():
+            self._completions.get_nowait().cancel()
+        await asyncio.gather(
+            *([self._task] if self._task else []), *self._tasks, return_exceptions=True
+        )
+        self._task = None
+        if self.shutdown:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _complete(self, future):
+        try:
+            result = await future
+            if self.result_callback is not None:
+                await self.result_callback(result)
+        except Exception as e:
+            report_callback_error(e)
+        finally:
+            self.pending -= 1
+            self._slots.release()
+
+    async def _complete_in_order(self):
+        while True:
+            await self._complete(await self._completions.get())
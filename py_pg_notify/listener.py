@@ -2,16 +2,70 @@
 Module to manage PostgreSQL notification listeners using asyncpg.
 """
 
-from typing import Callable
+import asyncio
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Tuple, Union
+import asyncpg
 from .pgmanager import PGManager, PGConfig
+from .dispatcher import (
+    Batcher,
+    Coalescer,
+    Dispatcher,
+    ExecutorDispatcher,
+    is_async_callable,
+    put_with_overflow,
+    run_in_executor,
+    validate_overflow,
+)
+from .overflow import OverflowResolver
+from .outbox import OutboxSubscription
+from .router import Router
+from .decoders import DEFAULT_JSON_DECODER
+from .compression import decompress
+from .serializers import PayloadDecoder, Serializer
+from .metrics import (
+    DROPPED,
+    END_TO_END_LATENCY,
+    ERRORS,
+    HANDLER_LATENCY,
+    QUEUE_DEPTH,
+    RECEIVED,
+    Metrics,
+    unstamp,
+)
+
+# Queued by close() to end active streams
+_STREAM_CLOSED = object()
+
+# Marks a Notification whose payload has not been decoded yet
+_UNDECODED = object()
+
+
+def _json_path(path: str) -> Callable:
+    # "new.product_id" -> notification.json["new"]["product_id"]
+    keys = path.split(".")
+
+    def _key(notification):
+        value = notification.json
+        for key in keys:
+            value = value[key]
+        return value
+
+    return _key
 
 
 class Notification:
     """
     Represents a Notification message.
+
+    The payload is decoded as JSON on first access to `json` and the result is cached.
     """
 
-    def __init__(self, connection, pid, channel, payload):
+    __slots__ = ("connection", "pid", "channel", "payload", "_decoder", "_json")
+
+    def __init__(self, connection, pid, channel, payload, decoder: Callable = None):
         """
         Initializes a Notification instance.
 
@@ -20,11 +74,34 @@ class Notification:
             pid (int): The process ID of the sender.
             channel (str): The name of the channel the notification was sent on.
             payload (str): The message payload of the notification.
+            decoder (callable, optional): The function used to decode the JSON payload.
+                Defaults to orjson or msgspec when installed, otherwise `json.loads`.
         """
         self.connection = connection
         self.pid = pid
         self.channel = channel
         self.payload = payload
+        self._decoder = decoder or DEFAULT_JSON_DECODER
+        self._json = _UNDECODED
+
+    @property
+    def json(self):
+        """
+        The decoded payload, decoded once and cached.
+
+        Payloads are JSON unless a Notifier serializer put an envelope header naming
+        another format on them; Listeners decode those with the named serializer.
+        """
+        if self._json is _UNDECODED:
+            self._json = self._decoder(self.payload)
+        return self._json
+
+    def __reduce__(self):
+        # Connections cannot cross process boundaries; the copy has none
+        return (
+            Notification,
+            (None, self.pid, self.channel, self.payload, self._decoder),
+        )
 
     def __repr__(self):
         return (
@@ -38,41 +115,438 @@ class Listener(PGManager):
     A class for listening to PostgreSQL notifications.
     """
 
-    def __init__(self, config: PGConfig):
+    def __init__(
+        self,
+        config: PGConfig,
+        overflow_table: str = None,
+        decoder: Callable = None,
+        reconnect: bool = False,
+        reconnect_delay: float = 0.5,
+        reconnect_max_delay: float = 30.0,
+        max_threads: int = None,
+        metrics: Metrics = None,
+        serializers: Iterable[Serializer] = None,
+    ):
         """
         Initializes the Listener class with the given PostgreSQL connection configuration.
 
         Args:
             config (PGConfig): An instance of PGConfig containing connection details.
+            overflow_table (str, optional): The overflow table used by trigger functions
+                created with `overflow_table`. When given, overflow references are
+                replaced by the stored payloads before notifications are delivered.
+            decoder (callable, optional): The JSON decoder behind `Notification.json`.
+                Defaults to orjson or msgspec when installed, otherwise `json.loads`.
+            reconnect (bool, optional): If True, a lost connection is re-established in the
+                background and every channel is listened to again. Defaults to False.
+            reconnect_delay (float, optional): The base delay, in seconds, between reconnection
+                attempts. It doubles after each failure and is randomly jittered. Defaults to 0.5.
+            reconnect_max_delay (float, optional): The maximum delay, in seconds, between
+                reconnection attempts. Defaults to 30.
+            max_threads (int, optional): The size of the thread pool shared by synchronous
+                callbacks. Defaults to the `ThreadPoolExecutor` default.
+            metrics (Metrics, optional): Receives per-channel counts of received and dropped
+                notifications and handler errors, handler and end-to-end latencies, and
+                dispatch queue depths. Defaults to None, which disables metrics.
+            serializers (Iterable[Serializer], optional): Custom serializers used by Notifiers,
+                for decoding payloads whose envelope header names them. The built-in
+                serializers are always recognized.
+
+        Raises:
+            ValueError: If the configuration enables pooled mode. LISTEN is bound to a
+                session, so a Listener always uses a single dedicated connection.
         """
+        if config.use_pool:
+            raise ValueError("Listener requires a dedicated connection; `use_pool` is not supported.")
         super().__init__(config)
         self.listeners = {}
+        self.dispatchers = {}
+        self.streams = {}
+        self.router = Router()
+        self.routed_channels = set()
+        self._known_channels = set()
+        # asyncpg runs one operation at a time per connection
+        self._conn_lock = asyncio.Lock()
+        self.overflow_resolver = (
+            OverflowResolver(overflow_table, self._conn_lock) if overflow_table else None
+        )
+        self.decoder = PayloadDecoder(decoder, serializers or ())
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.reconnects = 0
+        self._reconnect_task = None
+        self.max_threads = max_threads
+        self.executor = None
+        self.metrics = metrics
+
+    async def connect(self):
+        """
+        Establishes a connection to the PostgreSQL database.
+
+        With `reconnect` enabled, the connection is watched through an asyncpg
+        termination listener so that its loss is detected immediately.
 
-    async def add_listener(self, channel: str, callback: Callable):
+        Raises:
+            asyncpg.exceptions.PostgresError: If the connection to the PostgreSQL database fails.
+        """
+        await super().connect()
+        if self.reconnect and self.conn is not None:
+            self.conn.add_termination_listener(self._on_connection_lost)
+
+    def _on_connection_lost(self, connection):
+        # Termination listeners also fire on close(), when self.conn is already reset
+        if connection is not self.conn:
+            return
+        self.conn = None
+        self._reconnect_task = asyncio.create_task(self._reestablish())
+
+    async def _reestablish(self):
+        delay = self.reconnect_delay
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn, **self._connect_kwargs())
+                for channel, callback in self._registrations():
+                    await conn.add_listener(channel, callback)
+            except Exception:
+                if conn is not None:
+                    conn.terminate()
+                # Full jitter keeps many listeners from reconnecting in lockstep
+                await asyncio.sleep(random.uniform(0, delay))
+                delay = min(delay * 2, self.reconnect_max_delay)
+                continue
+
+            conn.add_termination_listener(self._on_connection_lost)
+            self.conn = conn
+            self.reconnects += 1
+            self._reconnect_task = None
+            # Read what was appended to outboxes while disconnected
+            for dispatcher in self.dispatchers.values():
+                if isinstance(dispatcher, OutboxSubscription):
+                    dispatcher.wake()
+            return
+
+    def _thread_pool(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                self.max_threads, thread_name_prefix="py-pg-notify"
+            )
+        return self.executor
+
+    def _registrations(self):
+        # Every (channel, callback) pair registered on the connection
+        yield from self.listeners.items()
+        yield from self.streams.values()
+        for channel in self.routed_channels:
+            yield channel, self._route
+
+    async def _fetch(self, query: str, *args):
+        if self.conn is None:
+            raise RuntimeError("Listener not connected. Call `connect()` first.")
+        async with self._conn_lock:
+            return await self.conn.fetch(query, *args)
+
+    async def _notification(self, connection, pid, channel, payload):
+        if self.overflow_resolver:
+            payload = await self.overflow_resolver.resolve(connection, payload)
+        payload = self._decode_payload(channel, payload)
+        return Notification(connection, pid, channel, payload, self.decoder)
+
+    def _decode_payload(self, channel, payload):
+        # Reverses the send time and compression a Notifier may have applied
+        payload, sent_at = unstamp(payload)
+        if self.metrics:
+            self.metrics.increment(RECEIVED, channel)
+            if sent_at is not None:
+                self.metrics.observe(END_TO_END_LATENCY, channel, time.time() - sent_at)
+        return decompress(payload)
+
+    def _instrument(self, channel, callback, executor=None):
+        # Runs a synchronous callback in the thread pool, then times it and counts
+        # its exceptions when metrics are enabled
+        if not is_async_callable(callback):
+            callback = run_in_executor(callback, executor or self._thread_pool())
+        if not self.metrics:
+            return callback
+        metrics = self.metrics
+
+        async def _timed_callback(item):
+            start = time.perf_counter()
+            try:
+                return await callback(item)
+            except Exception:
+                metrics.increment(ERRORS, channel)
+                raise
+            finally:
+                metrics.observe(HANDLER_LATENCY, channel, time.perf_counter() - start)
+
+        return _timed_callback
+
+    async def add_listener(
+        self,
+        channel: str,
+        callback: Callable,
+        *,
+        queue_size: int = None,
+        workers: int = 1,
+        overflow: str = "block",
+        executor: Executor = None,
+    ):
         """
         Adds a listener for a specific channel.
 
+        By default the callback is awaited directly for every notification. When
+        `queue_size` is given, notifications are queued in a bounded Dispatcher and
+        handled by `workers` worker tasks instead. With the "block" overflow policy a
+        full queue limits the handlers running at once, not memory: asyncpg keeps
+        delivering, and each notification waits in a task of its own. Use a drop
+        policy to bound memory during bursts.
+
+        Synchronous callbacks are detected and called in a thread pool so that blocking
+        code does not stall the event loop. They are always queued, in a queue of 1000
+        notifications unless `queue_size` is given, and `workers` caps the number of
+        calls running at the same time.
+
+        Args:
+            channel (str): The channel to listen to.
+            callback (callable): A function to handle notifications.
+            queue_size (int, optional): The capacity of the dispatch queue. Defaults to None.
+            workers (int, optional): The number of worker tasks. Defaults to 1.
+            overflow (str, optional): The policy applied when the queue is full:
+                "block", "drop_oldest" or "drop_newest". Defaults to "block".
+            executor (Executor, optional): The executor running a synchronous callback.
+                Defaults to the thread pool shared by the Listener's synchronous callbacks.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            ValueError: If the dispatcher arguments are invalid.
+            Exception: If there is an error while adding the listener.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before adding a listener."
+            )
+
+        handler = self._instrument(channel, callback, executor)
+        dispatcher = None
+        if not is_async_callable(callback):
+            dispatcher = Dispatcher(handler, queue_size or 1000, workers, overflow)
+        elif queue_size is not None:
+            dispatcher = Dispatcher(handler, queue_size, workers, overflow)
+
+        await self._register(channel, handler, dispatcher)
+
+    async def add_batch_listener(
+        self,
+        channel: str,
+        callback: Callable,
+        max_batch: int = 100,
+        max_delay_ms: float = 100,
+    ):
+        """
+        Adds a listener that receives the notifications of a channel in lists.
+
+        Notifications are collected and the callback is called with a list of them
+        once `max_batch` have arrived or `max_delay_ms` milliseconds have passed since
+        the first one, whichever comes first. A synchronous callback is called in the
+        Listener's thread pool.
+
+        Args:
+            channel (str): The channel to listen to.
+            callback (callable): A function to handle a list of notifications.
+            max_batch (int, optional): The maximum number of notifications per list. Defaults to 100.
+            max_delay_ms (float, optional): The maximum delay before a partial list is
+                delivered, in milliseconds. Defaults to 100.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            ValueError: If the batching arguments are invalid.
+            Exception: If there is an error while adding the listener.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before adding a listener."
+            )
+
+        batcher = Batcher(self._instrument(channel, callback), max_batch, max_delay_ms / 1000)
+        await self._register(channel, callback, batcher)
+
+    async def add_coalescing_listener(
+        self,
+        channel: str,
+        callback: Callable,
+        key: Union[str, Callable],
+        window_ms: float = 100,
+    ):
+        """
+        Adds a listener that only receives the latest notification per key.
+
+        Notifications are held for `window_ms` milliseconds after the first one arrives.
+        A notification replaces a held one with the same key, so a row updated many
+        times within the window is handled once, with its latest state. Notifications
+        whose key cannot be extracted are delivered immediately. A synchronous callback
+        is called in the Listener's thread pool.
+
         Args:
             channel (str): The channel to listen to.
             callback (callable): A function to handle notifications.
+            key (Union[str, callable]): A dotted path into the JSON payload, such as
+                "new.product_id", or a function returning the key of a Notification.
+            window_ms (float, optional): The coalescing window, in milliseconds. Defaults to 100.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            ValueError: If the window is invalid.
+            Exception: If there is an error while adding the listener.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before adding a listener."
+            )
+
+        key = _json_path(key) if isinstance(key, str) else key
+        coalescer = Coalescer(self._instrument(channel, callback), key, window_ms / 1000)
+        await self._register(channel, callback, coalescer)
+
+    async def add_process_listener(
+        self,
+        channel: str,
+        callback: Callable,
+        processes: int = None,
+        ordered: bool = True,
+        max_pending: int = 1000,
+        result_callback: Callable = None,
+    ):
+        """
+        Adds a listener whose callback runs in a pool of worker processes.
+
+        Use it for CPU-heavy handlers that would otherwise block the event loop that
+        receives notifications. The callback must be a picklable synchronous function,
+        defined at module level. It receives a copy of the Notification without its
+        connection, and overflow references are resolved before it is sent.
+
+        Args:
+            channel (str): The channel to listen to.
+            callback (callable): A synchronous function to handle notifications.
+            processes (int, optional): The number of worker processes. Defaults to the
+                number of CPUs.
+            ordered (bool, optional): If True, results and errors are handled in arrival
+                order, otherwise as soon as each call finishes. Defaults to True.
+            max_pending (int, optional): The maximum number of notifications sent to the pool
+                and not yet completed. Further notifications wait. Defaults to 1000.
+            result_callback (callable, optional): An async function called in the Listener
+                process with the return value of each call.
 
         Raises:
             RuntimeError: If called before the connection is established.
+            ValueError: If the pool arguments are invalid.
             Exception: If there is an error while adding the listener.
         """
         if self.conn is None:
             raise RuntimeError(
                 "Listener not connected. Call `connect()` before adding a listener."
             )
+        if max_pending < 1:
+            raise ValueError("max_pending must be a positive integer")
+
+        dispatcher = ExecutorDispatcher(
+            callback,
+            ProcessPoolExecutor(max_workers=processes),
+            max_pending,
+            ordered,
+            result_callback,
+            shutdown=True,
+        )
+        await self._register(channel, callback, dispatcher)
+
+    async def add_outbox_listener(
+        self,
+        channel: str,
+        callback: Callable,
+        outbox_table: str = "pg_notify_outbox",
+        consumer: str = None,
+        after: Tuple[int, int] = None,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Adds a durable listener for a channel published through an outbox table.
 
+        Notifications are read from the outbox, in order and at least once, and NOTIFY
+        only signals that new rows exist. Reads resume after the last delivered row,
+        so rows appended while the Listener was disconnected are delivered when it
+        reconnects. See OutboxSubscription for details.
+
+        Args:
+            channel (str): The channel to listen to.
+            callback (callable): A function to handle notifications.
+            outbox_table (str, optional): The outbox table. Defaults to "pg_notify_outbox".
+            consumer (str, optional): A name under which the read position is persisted in
+                the outbox offsets table, so that a restarted consumer resumes where it stopped.
+            after (Tuple[int, int], optional): The (txid, id) position to start after when no
+                persisted position exists. Defaults to the start of the outbox.
+            batch_size (int, optional): The number of rows read per query. Defaults to 500.
+            poll_interval (float, optional): Seconds between reads without a wake-up, which
+                pick up rows held back by older transactions still open at the wake-up.
+                A row is delivered at most this long after every older transaction has
+                finished. Defaults to 1. None disables polling, and held-back rows then
+                wait for the next wake-up on the channel.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            ValueError: If the outbox arguments are invalid.
+            Exception: If there is an error while adding the listener.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before adding a listener."
+            )
+
+        handler = self._instrument(channel, callback)
+
+        async def _deliver(payload):
+            payload = self._decode_payload(channel, payload)
+            await handler(Notification(self.conn, None, channel, payload, self.decoder))
+
+        subscription = OutboxSubscription(
+            channel,
+            _deliver,
+            self._fetch,
+            outbox_table,
+            consumer,
+            after,
+            batch_size,
+            poll_interval,
+        )
+        await self._register(channel, callback, subscription, wake_up=True)
+
+    async def _register(self, channel, callback, dispatcher=None, wake_up=False):
         try:
 
             async def _wrapped_callback(connection, pid, channel, payload):
-                notification = Notification(connection, pid, channel, payload)
-                await callback(notification)
+                if wake_up:
+                    # Outbox wake-ups carry no data; rows are counted when delivered
+                    await dispatcher.put(Notification(connection, pid, channel, payload))
+                    return
+                notification = await self._notification(
+                    connection, pid, channel, payload
+                )
+                if dispatcher is None:
+                    await callback(notification)
+                elif await dispatcher.put(notification) is False and self.metrics:
+                    self.metrics.increment(DROPPED, channel)
 
+            async with self._conn_lock:
+                await self.conn.add_listener(channel, _wrapped_callback)
             self.listeners[channel] = _wrapped_callback
-            await self.conn.add_listener(channel, _wrapped_callback)
+            if dispatcher:
+                dispatcher.start()
+                self.dispatchers[channel] = dispatcher
+                if self.metrics:
+                    self.metrics.register_gauge(
+                        QUEUE_DEPTH, channel, lambda: dispatcher.depth
+                    )
         except Exception as e:
             raise Exception(f"Error adding listener to channel '{channel}': {e}")
 
@@ -95,8 +569,13 @@ class Listener(PGManager):
 
         try:
             if channel in self.listeners:
-                await self.conn.remove_listener(channel, self.listeners[channel])
+                async with self._conn_lock:
+                    await self.conn.remove_listener(channel, self.listeners[channel])
                 del self.listeners[channel]
+                if channel in self.dispatchers:
+                    await self.dispatchers.pop(channel).stop()
+                    if self.metrics:
+                        self.metrics.unregister_gauge(QUEUE_DEPTH, channel)
             else:
                 raise KeyError(f"No listener found for channel '{channel}'.")
         except KeyError as e:
@@ -104,6 +583,212 @@ class Listener(PGManager):
         except Exception as e:
             raise Exception(f"Error removing listener from channel '{channel}': {e}")
 
+    async def add_pattern_listener(self, pattern: str, callback: Callable):
+        """
+        Adds a listener for every channel matching a pattern.
+
+        Channel names are split on "." into segments; "*" matches one segment and a
+        final "**" matches any remaining segments, e.g. "orders.eu.*" or "orders.**".
+        PostgreSQL can only LISTEN to exact channel names, so patterns apply to the
+        channels declared with `listen()`. The Listener LISTENs to exactly those
+        declared channels that match at least one pattern, and updates the server-side
+        LISTENs whenever patterns or declared channels change. A synchronous callback
+        is called in the Listener's thread pool.
+
+        Args:
+            pattern (str): The channel pattern.
+            callback (callable): A function to handle notifications.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            ValueError: If the pattern is malformed.
+            Exception: If there is an error while updating the LISTENs.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before adding a listener."
+            )
+        self.router.add(pattern, self._instrument(pattern, callback))
+        await self._sync_routes()
+
+    async def remove_pattern_listener(self, pattern: str):
+        """
+        Removes the listeners of a pattern, unlistening from channels no longer matched.
+
+        Args:
+            pattern (str): The channel pattern.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            KeyError: If no listener exists for the pattern.
+            Exception: If there is an error while updating the LISTENs.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before removing a listener."
+            )
+        self.router.remove(pattern)
+        await self._sync_routes()
+
+    async def listen(self, *channels: str):
+        """
+        Declares channels that pattern listeners may match.
+
+        Args:
+            *channels (str): The channel names.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            Exception: If there is an error while updating the LISTENs.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before listening to channels."
+            )
+        self._known_channels.update(channels)
+        await self._sync_routes()
+
+    async def unlisten(self, *channels: str):
+        """
+        Withdraws channels declared with `listen()`.
+
+        Args:
+            *channels (str): The channel names.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            Exception: If there is an error while updating the LISTENs.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before unlistening from channels."
+            )
+        self._known_channels.difference_update(channels)
+        await self._sync_routes()
+
+    async def _sync_routes(self):
+        wanted = {c for c in self._known_channels if self.router.match(c)}
+        try:
+            async with self._conn_lock:
+                for channel in sorted(wanted - self.routed_channels):
+                    await self.conn.add_listener(channel, self._route)
+                    self.routed_channels.add(channel)
+                for channel in sorted(self.routed_channels - wanted):
+                    await self.conn.remove_listener(channel, self._route)
+                    self.routed_channels.discard(channel)
+        except Exception as e:
+            raise Exception(f"Error updating pattern listeners: {e}")
+
+    async def _route(self, connection, pid, channel, payload):
+        handlers = self.router.match(channel)
+        if not handlers:
+            return
+        notification = await self._notification(connection, pid, channel, payload)
+        for handler in handlers:
+            await handler(notification)
+
+    async def stream(
+        self,
+        channel: str,
+        batch_size: int = None,
+        timeout: float = None,
+        buffer_size: int = 1000,
+        overflow: str = "block",
+    ):
+        """
+        Streams notifications from a channel as an asynchronous iterator.
+
+        Notifications are buffered while the consumer is busy and pulled at its own
+        pace. The channel is listened to for as long as the iteration runs, and the
+        stream ends when the Listener is closed.
+
+        Usage:
+            async for notification in listener.stream("ch_01"):
+                ...
+            async for batch in listener.stream("ch_01", batch_size=100, timeout=0.5):
+                ...
+
+        Args:
+            channel (str): The channel to listen to.
+            batch_size (int, optional): If given, lists of up to this many notifications
+                are yielded instead of single notifications. Defaults to None.
+            timeout (float, optional): Seconds to wait for a batch to fill before yielding
+                it partially filled. If None, a batch holds the notifications already
+                buffered. Only used when batch_size is given. Defaults to None.
+            buffer_size (int, optional): The capacity of the buffer. Defaults to 1000.
+            overflow (str, optional): The policy applied when the buffer is full:
+                "block", "drop_oldest" or "drop_newest". Defaults to "block".
+
+        Yields:
+            Notification, or list of Notification when batch_size is given.
+
+        Raises:
+            RuntimeError: If called before the connection is established.
+            ValueError: If the arguments are invalid.
+            Exception: If there is an error while listening to the channel.
+        """
+        if self.conn is None:
+            raise RuntimeError(
+                "Listener not connected. Call `connect()` before streaming a channel."
+            )
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be a positive integer")
+        validate_overflow(overflow)
+
+        buffer = asyncio.Queue(maxsize=buffer_size)
+
+        async def _buffer_callback(connection, pid, channel, payload):
+            notification = await self._notification(connection, pid, channel, payload)
+            if not await put_with_overflow(buffer, notification, overflow) and self.metrics:
+                self.metrics.increment(DROPPED, channel)
+
+        try:
+            async with self._conn_lock:
+                await self.conn.add_listener(channel, _buffer_callback)
+        except Exception as e:
+            raise Exception(f"Error streaming channel '{channel}': {e}")
+        self.streams[buffer] = (channel, _buffer_callback)
+
+        try:
+            while True:
+                item = await buffer.get()
+                if item is _STREAM_CLOSED:
+                    return
+                if batch_size is None:
+                    yield item
+                    continue
+
+                batch, closed = await self._fill_batch(buffer, [item], batch_size, timeout)
+                yield batch
+                if closed:
+                    return
+        finally:
+            if self.streams.pop(buffer, None) and self.conn is not None:
+                async with self._conn_lock:
+                    await self.conn.remove_listener(channel, _buffer_callback)
+
+    @staticmethod
+    async def _fill_batch(buffer, batch, batch_size, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        while len(batch) < batch_size:
+            if not buffer.empty():
+                item = buffer.get_nowait()
+            elif deadline is None:
+                break
+            else:
+                try:
+                    item = await asyncio.wait_for(buffer.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+            if item is _STREAM_CLOSED:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
     async def close(self):
         """
         Closes the connection to the PostgreSQL database and removes all listeners.
@@ -111,12 +796,35 @@ class Listener(PGManager):
         Raises:
             Exception: If there is an error while closing the connection or removing listeners.
         """
-        if self.conn:
-            try:
-                for channel, callback in self.listeners.items():
-                    await self.conn.remove_listener(channel, callback)
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+
+        try:
+            for channel, dispatcher in self.dispatchers.items():
+                await dispatcher.stop()
+                if self.metrics:
+                    self.metrics.unregister_gauge(QUEUE_DEPTH, channel)
+            if self.conn:
+                async with self._conn_lock:
+                    for channel, callback in self._registrations():
+                        await self.conn.remove_listener(channel, callback)
+            for buffer in self.streams:
+                if buffer.full():
+                    buffer.get_nowait()
+                buffer.put_nowait(_STREAM_CLOSED)
+            if self.conn:
                 await self.conn.close()
                 self.conn = None
-                self.listeners = {}
-            except Exception as e:
-                raise Exception(f"Error closing listener connection: {e}")
+            self.listeners = {}
+            self.dispatchers = {}
+            self.streams = {}
+            self.router = Router()
+            self.routed_channels = set()
+            self._known_channels = set()
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+        except Exception as e:
+            raise Exception(f"Error closing listener connection: {e}")
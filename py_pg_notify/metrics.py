@@ -0,0 +1,245 @@
+"""
+Module to collect Listener and Notifier metrics and expose them in Prometheus text format.
+"""
+
+import bisect
+import time
+from typing import Callable, Iterable
+
+# Separates the send timestamp embedded by a Notifier from the payload
+TIMESTAMP_MARK = "\x1e"
+
+# Counters
+SENT = "sent"
+RECEIVED = "received"
+DROPPED = "dropped"
+ERRORS = "errors"
+THROTTLED = "throttled"
+REJECTED = "rejected"
+
+# Histograms, in seconds
+HANDLER_LATENCY = "handler_seconds"
+END_TO_END_LATENCY = "latency_seconds"
+
+# Gauges
+QUEUE_DEPTH = "queue_depth"
+NOTIFICATION_QUEUE_USAGE = "notification_queue_usage"
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_DESCRIPTIONS = {
+    SENT: "Notifications sent.",
+    RECEIVED: "Notifications received.",
+    DROPPED: "Notifications dropped by a full dispatch queue.",
+    ERRORS: "Exceptions raised by notification handlers.",
+    THROTTLED: "Notifications delayed because the server's notification queue was filling up.",
+    REJECTED: "Notifications rejected because the server's notification queue was nearly full.",
+    HANDLER_LATENCY: "Time spent in notification handlers.",
+    END_TO_END_LATENCY: "Time from Notifier.notify to receipt by the Listener.",
+    QUEUE_DEPTH: "Notifications waiting in the dispatch queue.",
+    NOTIFICATION_QUEUE_USAGE: "Fraction of the server's notification queue in use.",
+}
+
+
+def stamp(payload: str) -> str:
+    """
+    Prefixes a payload with the current time, for end-to-end latency measurement.
+
+    Args:
+        payload (str): The notification payload.
+
+    Returns:
+        str: The stamped payload.
+    """
+    return f"{TIMESTAMP_MARK}{time.time():.6f}{TIMESTAMP_MARK}{payload}"
+
+
+def unstamp(payload: str):
+    """
+    Splits a payload stamped by `stamp` into the original payload and its send time.
+
+    Args:
+        payload (str): The notification payload.
+
+    Returns:
+        tuple: The original payload and the send time, which is None for unstamped payloads.
+    """
+    if not payload.startswith(TIMESTAMP_MARK):
+        return payload, None
+    end = payload.find(TIMESTAMP_MARK, 1)
+    if end < 0:
+        return payload, None
+    try:
+        sent_at = float(payload[1:end])
+    except ValueError:
+        return payload, None
+    return payload[end + 1 :], sent_at
+
+
+class Metrics:
+    """
+    The interface through which Listener and Notifier report metrics.
+
+    Every method is a no-op; subclass it to forward metrics to another system.
+    Metrics are identified by a short name, such as "received", and labelled with
+    the notification channel.
+    """
+
+    def increment(self, name: str, channel: str, value: int = 1):
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): The counter name.
+            channel (str): The channel label.
+            value (int, optional): The amount to add. Defaults to 1.
+        """
+
+    def observe(self, name: str, channel: str, value: float):
+        """
+        Records a value, in seconds, in a histogram.
+
+        Args:
+            name (str): The histogram name.
+            channel (str): The channel label.
+            value (float): The observed value.
+        """
+
+    def register_gauge(self, name: str, channel: str, func: Callable):
+        """
+        Registers a function returning the current value of a gauge.
+
+        Args:
+            name (str): The gauge name.
+            channel (str): The channel label.
+            func (callable): A function without arguments returning the value.
+        """
+
+    def unregister_gauge(self, name: str, channel: str):
+        """
+        Removes a gauge registered with `register_gauge`.
+
+        Args:
+            name (str): The gauge name.
+            channel (str): The channel label.
+        """
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Keeps metrics in memory and renders them in the Prometheus text exposition format.
+
+    Values are updated from the event loop without locking, so `render` should be
+    called from the event loop thread too, for example in an HTTP handler of the
+    same application.
+    """
+
+    def __init__(self, prefix: str = "pg_notify", buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initializes the PrometheusMetrics class.
+
+        Args:
+            prefix (str, optional): The prefix of every metric name. Defaults to "pg_notify".
+            buckets (Iterable[float], optional): The upper bounds of the histogram buckets,
+                in seconds.
+        """
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+
+    def increment(self, name: str, channel: str, value: int = 1):
+        key = (name, channel)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, channel: str, value: float):
+        histogram = self.histograms.get((name, channel))
+        if histogram is None:
+            histogram = self.histograms[(name, channel)] = _Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect.bisect_left(self.buckets, value)] += 1
+        histogram.sum += value
+        histogram.count += 1
+
+    def register_gauge(self, name: str, channel: str, func: Callable):
+        self.gauges[(name, channel)] = func
+
+    def unregister_gauge(self, name: str, channel: str):
+        self.gauges.pop((name, channel), None)
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, samples in self._group(self.counters):
+            self._header(lines, f"{name}_total", name, "counter")
+            for channel, value in samples:
+                lines.append(f"{self.prefix}_{name}_total{_labels(channel)} {value}")
+
+        for name, samples in self._group(self.gauges):
+            self._header(lines, name, name, "gauge")
+            for channel, func in samples:
+                lines.append(f"{self.prefix}_{name}{_labels(channel)} {func()}")
+
+        bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+        for name, samples in self._group(self.histograms):
+            self._header(lines, name, name, "histogram")
+            for channel, histogram in samples:
+                cumulative = 0
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f"{self.prefix}_{name}_bucket{_labels(channel, le=bound)} {cumulative}"
+                    )
+                lines.append(f"{self.prefix}_{name}_sum{_labels(channel)} {histogram.sum}")
+                lines.append(f"{self.prefix}_{name}_count{_labels(channel)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _header(self, lines, metric, name, metric_type):
+        lines.append(f"# HELP {self.prefix}_{metric} {_DESCRIPTIONS.get(name, name)}")
+        lines.append(f"# TYPE {self.prefix}_{metric} {metric_type}")
+
+    @staticmethod
+    def _group(values):
+        groups = {}
+        for (name, channel), value in list(values.items()):
+            groups.setdefault(name, []).append((channel, value))
+        return sorted(groups.items())
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(channel: str, **extra) -> str:
+    labels = {"channel": channel, **extra}
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
@@ -2,17 +2,84 @@
 Module to manage PostgreSQL notification triggers using asyncpg.
 """
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, List, Mapping, Tuple, Union
 from .pgmanager import PGManager, PGConfig
+from .metrics import NOTIFICATION_QUEUE_USAGE, REJECTED, SENT, THROTTLED, Metrics, stamp
+from .dispatcher import Batcher
+from .compression import Compressor
+from .serializers import Serializer, get_serializer, serialize
+from .throttle import QueueThrottle
 from .utils import (
-    notify_query,
+    NOTIFY_QUERY,
+    NOTIFY_MANY_QUERY,
+    NOTIFICATION_QUEUE_USAGE_QUERY,
     create_trigger_function_query,
+    create_statement_trigger_function_query,
+    create_overflow_table_query,
+    purge_overflow_payloads_query,
+    create_outbox_table_query,
+    outbox_notify_query,
+    outbox_notify_many_query,
+    purge_outbox_query,
+    MAX_NOTIFY_PAYLOAD_SIZE,
     GET_TRIGGER_FUNCTIONS_QUERY,
     GET_TRIGGERS_QUERY,
+    GET_TRIGGERS_MANY_QUERY,
+    GET_TRIGGER_FUNCTIONS_MANY_QUERY,
+    GET_FUNCTION_SOURCES_QUERY,
+    GET_TRIGGER_DEFINITIONS_QUERY,
     drop_function_query,
     create_trigger_query,
     drop_trigger_query,
+    function_source,
+    trigger_transition_tables,
+    trigger_type,
 )
 
+# Keys of a provisioning spec that describe the trigger rather than its function
+_TRIGGER_SPEC_KEYS = {
+    "table_name",
+    "trigger_name",
+    "function_name",
+    "channel",
+    "event",
+    "timing",
+    "level",
+}
+
+_FUNCTION_SPEC_KEYS = {
+    "ROW": {
+        "overflow_table",
+        "max_payload_size",
+        "columns",
+        "diff",
+        "key_columns",
+        "outbox_table",
+    },
+    "STATEMENT": {
+        "chunk_size",
+        "summary_key",
+        "overflow_table",
+        "max_payload_size",
+        "outbox_table",
+    },
+}
+
+
+def _validate_trigger(event: str, timing: str, level: str):
+    if event not in ["INSERT", "UPDATE", "DELETE"]:
+        raise ValueError("event value must be either INSERT', 'UPDATE' or 'DELETE'")
+    if timing not in ["BEFORE", "AFTER"]:
+        raise ValueError("timing value must be either 'BEFORE' or 'AFTER'")
+    if level not in ["ROW", "STATEMENT"]:
+        raise ValueError("level value must be either 'ROW' or 'STATEMENT'")
+    if level == "STATEMENT" and timing != "AFTER":
+        raise ValueError("statement-level triggers must use 'AFTER' timing")
+
 
 class Notifier(PGManager):
     """
@@ -20,71 +87,610 @@ class Notifier(PGManager):
 
     Key Features:
     - Send custom notifications using notify
+    - Publish batches of notifications in a single round trip using notify_many
     - Dynamic creation and removal of triggers and notification functions.
     - Retrieval of existing triggers and functions.
     - Context manager support for easier resource management.
+    - Optional connection pool (`PGConfig(use_pool=True)`) for concurrent publishers.
+    - Optional durable outbox mode, where NOTIFY only wakes the listeners.
+    - Optional metrics and send timestamps for end-to-end latency measurement.
+    - Transaction-scoped buffering that sends all notifications of a transaction at once.
+    - Optional auto-batching of concurrent notify calls.
+    - Optional throttling while the server's notification queue fills up.
     """
 
-    def __init__(self, config: PGConfig):
+    def __init__(
+        self,
+        config: PGConfig,
+        outbox_table: str = None,
+        metrics: Metrics = None,
+        timestamps: bool = False,
+        catalog_cache: bool = False,
+        auto_batch_size: int = None,
+        auto_batch_delay_ms: float = 5,
+        compression: Compressor = None,
+        serializer: Union[str, Serializer] = None,
+        queue_check_interval: float = None,
+        queue_throttle_usage: float = 0.5,
+        queue_reject_usage: float = 0.9,
+        queue_max_delay: float = 1.0,
+    ):
         """
         Initializes the Notifier class with the given PostgreSQL connection configuration.
 
         Args:
             config (PGConfig): An instance of PGConfig containing connection details.
+            outbox_table (str, optional): An outbox table created with `create_outbox_table`.
+                When given, `notify` and `notify_many` append payloads to the outbox and
+                NOTIFY only wakes the listeners, which read them with `add_outbox_listener`.
+            metrics (Metrics, optional): Receives the number of notifications sent per channel.
+                Defaults to None, which disables metrics.
+            timestamps (bool, optional): If True, the send time is embedded in each payload,
+                so that a Listener with metrics can measure end-to-end latency. The Listener
+                removes it before delivery; other consumers would see it. Defaults to False.
+            catalog_cache (bool, optional): If True, the results of `get_triggers`,
+                `get_trigger_functions` and their bulk variants are cached until this
+                Notifier changes a trigger or function, or `clear_catalog_cache` is called.
+                Defaults to False.
+            auto_batch_size (int, optional): If given, `notify` calls are collected and sent
+                together, in one statement per batch of at most this many notifications.
+                Each call returns once its batch has been sent. Defaults to None, which
+                sends every notification on its own.
+            auto_batch_delay_ms (float, optional): The longest time, in milliseconds, a
+                notification waits for its batch to fill. Defaults to 5.
+            compression (Compressor, optional): Compresses payloads above its size threshold
+                before they are sent. A Listener decompresses them transparently.
+                Defaults to None.
+            serializer (Union[str, Serializer], optional): "json", "orjson", "msgpack" or a
+                Serializer instance. When given, `notify` and `notify_many` accept any payload
+                object the serializer supports; strings are still sent unchanged. Defaults to None.
+            queue_check_interval (float, optional): If given, the usage of the server's
+                notification queue is sampled at most every this many seconds when
+                notifications are sent, and publishing is throttled as it fills up.
+                Defaults to None, which disables throttling.
+            queue_throttle_usage (float, optional): The queue usage, from 0 to 1, above which
+                `notify` and `notify_many` are delayed, more as usage rises. Defaults to 0.5.
+            queue_reject_usage (float, optional): The queue usage from which `notify` and
+                `notify_many` raise a RuntimeError instead of sending. Defaults to 0.9.
+            queue_max_delay (float, optional): The longest delay, in seconds, reached just
+                below queue_reject_usage. Defaults to 1.
+
+        Raises:
+            ValueError: If the auto-batching or queue throttling arguments are out of range
+                or the serializer is unknown.
+            ImportError: If the serializer's package is not installed.
         """
         super().__init__(config)
+        self.outbox_table = outbox_table
+        self._notify_query = (
+            outbox_notify_query(outbox_table) if outbox_table else NOTIFY_QUERY
+        )
+        self._notify_many_query = (
+            outbox_notify_many_query(outbox_table) if outbox_table else NOTIFY_MANY_QUERY
+        )
+        self._notify_statement = None
+        self.metrics = metrics
+        self.timestamps = timestamps
+        self.compression = compression
+        self.serializer = get_serializer(serializer) if serializer else None
+        self.catalog_cache = catalog_cache
+        self._triggers_cache = {}
+        self._functions_cache = {}
+        # Gives one task at a time the single connection, so that a transaction
+        # does not pick up statements of other tasks
+        self._conn_lock = asyncio.Lock()
+        # The (connection, buffer) of the transaction opened by the current task
+        self._transaction = ContextVar(f"notifier_transaction_{id(self)}", default=None)
+        self._auto_batcher = (
+            Batcher(self._send_auto_batch, auto_batch_size, auto_batch_delay_ms / 1000)
+            if auto_batch_size is not None
+            else None
+        )
+        self.throttle = (
+            QueueThrottle(
+                self.get_queue_usage,
+                queue_check_interval,
+                queue_throttle_usage,
+                queue_reject_usage,
+                queue_max_delay,
+            )
+            if queue_check_interval is not None
+            else None
+        )
+        if self.throttle and self.metrics:
+            self.metrics.register_gauge(NOTIFICATION_QUEUE_USAGE, "", lambda: self.throttle.usage)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Provides a connection for the duration of an `async with` block.
+
+        Inside `transaction()` the transaction's connection is yielded, so that queries
+        run through this Notifier take part in the transaction. Without a pool, the
+        single connection is used by one block at a time; other tasks wait, including
+        for the whole of a transaction.
+        """
+        current = self._transaction.get()
+        if current is not None:
+            yield current[0]
+            return
+        if self.pool is not None:
+            async with super().acquire() as conn:
+                yield conn
+            return
+        async with self._conn_lock:
+            async with super().acquire() as conn:
+                yield conn
 
-    async def notify(self, channel: str, payload: str):
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Opens a transaction in which notifications are buffered and sent together.
+
+        Within the `async with` block, `notify` and `notify_many` calls made by the
+        current task are buffered instead of sent. Right before COMMIT the buffer is
+        sent in a single statement, so N notifications cost one round trip and are
+        delivered if and only if the transaction commits. Run the data changes on
+        the yielded connection, or through this Notifier, to make them part of the
+        same transaction. Nested blocks become savepoints whose notifications are
+        kept only if they exit without an error.
+
+        Without a pool, the Notifier's single connection is reserved for the whole
+        transaction: `notify`, `execute` and other calls from other tasks wait until
+        it ends instead of joining it. Use `use_pool` to run transactions next to
+        other work.
+
+        Yields:
+            asyncpg.Connection: The connection running the transaction.
+
+        Raises:
+            RuntimeError: If the Notifier is not connected to the database.
+            Exception: If there is an error while sending the buffered notifications.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        outer = self._transaction.get()
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                buffer = []
+                token = self._transaction.set((conn, buffer))
+                try:
+                    yield conn
+                finally:
+                    self._transaction.reset(token)
+                if outer is not None:
+                    outer[1].extend(buffer)
+                elif buffer:
+                    try:
+                        await self._send_batches(conn, [buffer])
+                    except Exception as e:
+                        raise Exception(f"Error while sending the notifications: {e}")
+
+    async def notify(self, channel: str, payload: Any):
         """
         Sends a notification to the specified channel with the provided payload.
 
+        The channel and payload are bound as parameters of a statement that is
+        prepared once and reused for the lifetime of the connection. In pooled
+        mode each connection reuses it through its statement cache. Inside
+        `transaction()` the notification is buffered until the transaction commits.
+        With auto-batching, concurrent calls are sent together and each call returns
+        once its batch has been sent. With queue throttling, the call is delayed or
+        rejected while the server's notification queue fills up.
+
         Args:
             channel (str): The name of the channel to send the notification to.
-            payload (str): The payload or message to send along with the notification.
+            payload (Any): The payload or message to send along with the notification. Without
+                a serializer it must be a string.
 
         Raises:
-            RuntimeError: If the Notifier is not connected to the database.
+            RuntimeError: If the Notifier is not connected to the database, or the
+                notification queue usage is at or above queue_reject_usage.
             Exception: If there is an error while executing the pg_notify query.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError(
                 "Notifier not connected. Call connect() before creating a function."
             )
 
+        if self.throttle:
+            await self._admit([channel])
+        payload = self._encode(payload)
+
+        current = self._transaction.get()
+        if current is not None:
+            current[1].append((channel, payload))
+            return
+
+        if self._auto_batcher is not None:
+            future = asyncio.get_running_loop().create_future()
+            await self._auto_batcher.put((channel, payload, future))
+            await future
+            return
+
         try:
-            query = notify_query(channel, payload)
-            await self.conn.execute(query)
+            async with self.acquire() as conn:
+                if self.pool is not None:
+                    # Pooled connections reuse the statement through their own cache
+                    await conn.fetchval(self._notify_query, channel, payload)
+                else:
+                    if self._notify_statement is None:
+                        self._notify_statement = await conn.prepare(self._notify_query)
+                    await self._notify_statement.fetchval(channel, payload)
         except Exception as e:
             raise Exception(f"Error while sending the notification: {e}")
+        if self.metrics:
+            self.metrics.increment(SENT, channel)
+
+    async def notify_many(
+        self,
+        channel_payload_pairs: Iterable[Tuple[str, Any]],
+        batch_size: int = None,
+        transaction: bool = False,
+    ):
+        """
+        Sends many notifications, one round trip per batch.
+
+        Each batch is published with a single `pg_notify` statement over unnested
+        channel and payload arrays, so the order of the pairs is preserved.
+
+        Args:
+            channel_payload_pairs (Iterable[Tuple[str, Any]]): The (channel, payload) pairs to send.
+            batch_size (int, optional): The maximum number of notifications per statement.
+                If None, all notifications are sent in one statement.
+            transaction (bool, optional): If True, all batches are sent inside one transaction,
+                so the notifications are delivered together on commit. Defaults to False.
+
+        Returns:
+            list: A dictionary per batch containing the notification count and elapsed seconds.
+                Inside `transaction()` the notifications are buffered and the list is empty.
+
+        Raises:
+            RuntimeError: If the Notifier is not connected to the database, or the
+                notification queue usage is at or above queue_reject_usage.
+            ValueError: If batch_size is not a positive integer.
+            Exception: If there is an error while executing the pg_notify query.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        pairs = list(channel_payload_pairs)
+        if self.throttle and pairs:
+            await self._admit([channel for channel, _ in pairs])
+        if self.serializer or self.compression or self.timestamps:
+            pairs = [(channel, self._encode(payload)) for channel, payload in pairs]
+        current = self._transaction.get()
+        if current is not None:
+            current[1].extend(pairs)
+            return []
+
+        size = batch_size or len(pairs) or 1
+        batches = [pairs[i : i + size] for i in range(0, len(pairs), size)]
+
+        try:
+            async with self.acquire() as conn:
+                if transaction:
+                    async with conn.transaction():
+                        return await self._send_batches(conn, batches)
+                return await self._send_batches(conn, batches)
+        except Exception as e:
+            raise Exception(f"Error while sending the notifications: {e}")
+
+    async def get_queue_usage(self):
+        """
+        Returns the fraction of the server's notification queue in use.
+
+        Notifications wait in the queue until every listening session has read them;
+        once it is full, transactions that NOTIFY fail at commit.
+
+        Returns:
+            float: The queue usage, from 0 (empty) to 1 (full).
+
+        Raises:
+            RuntimeError: If the Notifier is not connected to the database.
+            Exception: If there is an error while querying the queue usage.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+        try:
+            async with self.acquire() as conn:
+                return await conn.fetchval(NOTIFICATION_QUEUE_USAGE_QUERY)
+        except Exception as e:
+            raise Exception(f"Error while getting the notification queue usage: {e}")
+
+    async def _admit(self, channels):
+        # A transaction holds the connection, so its notifications are admitted on the
+        # last sample; sampling would wait for the tasks queued behind the transaction
+        try:
+            delay = await self.throttle.admit(refresh=self._transaction.get() is None)
+        except RuntimeError:
+            if self.metrics:
+                for channel in channels:
+                    self.metrics.increment(REJECTED, channel)
+            raise
+        if delay and self.metrics:
+            for channel in channels:
+                self.metrics.increment(THROTTLED, channel)
+
+    def _encode(self, payload):
+        if self.serializer:
+            payload = serialize(self.serializer, payload)
+        if self.compression:
+            payload = self.compression.compress(payload)
+        if self.timestamps:
+            payload = stamp(payload)
+        return payload
+
+    async def _send_auto_batch(self, batch):
+        # Called by the auto-batcher; the outcome is reported through the futures
+        try:
+            async with self.acquire() as conn:
+                await self._send_batches(conn, [[(c, p) for c, p, _ in batch]])
+        except Exception as e:
+            error = Exception(f"Error while sending the notification: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def _send_batches(self, conn, batches):
+        timings = []
+        for batch in batches:
+            channels = [channel for channel, _ in batch]
+            payloads = [payload for _, payload in batch]
+            start = time.perf_counter()
+            await conn.execute(self._notify_many_query, channels, payloads)
+            timings.append(
+                {"count": len(batch), "elapsed": time.perf_counter() - start}
+            )
+            if self.metrics:
+                for channel in channels:
+                    self.metrics.increment(SENT, channel)
+        return timings
 
-    async def create_trigger_function(self, function_name: str, channel: str):
+    async def close(self):
+        """
+        Closes the connection to the PostgreSQL database and discards prepared statements.
+
+        Notifications waiting for an auto-batch are sent first.
+        """
+        if self._auto_batcher is not None:
+            await self._auto_batcher.stop()
+        self._notify_statement = None
+        self.clear_catalog_cache()
+        await super().close()
+
+    async def create_trigger_function(
+        self,
+        function_name: str,
+        channel: str,
+        overflow_table: str = None,
+        max_payload_size: int = MAX_NOTIFY_PAYLOAD_SIZE,
+        columns: List[str] = None,
+        diff: bool = False,
+        key_columns: List[str] = None,
+        outbox_table: str = None,
+    ):
         """
         Creates a PostgreSQL notification function.
 
         Args:
             function_name (str): The name of the trigger function to create.
             channel (str): The notification channel to send messages to.
+            overflow_table (str, optional): A table created with `create_overflow_table`.
+                When given, payloads larger than max_payload_size bytes are stored there
+                and only a reference to the row is notified.
+            max_payload_size (int, optional): The largest payload, in bytes, sent inline.
+                Defaults to 7999, just below the NOTIFY limit.
+            columns (List[str], optional): If given, only these columns are included in the
+                'new' and 'old' rows of the payload.
+            diff (bool, optional): If True, UPDATE notifications carry only the key columns
+                plus the columns whose values changed, and updates that change none of the
+                included columns are not notified. Defaults to False.
+            key_columns (List[str], optional): The key columns sent in diff mode. If None,
+                the primary key of the table is looked up when the trigger fires.
+            outbox_table (str, optional): An outbox table created with `create_outbox_table`.
+                When given, payloads are appended to the outbox and NOTIFY carries an empty
+                wake-up payload. Cannot be combined with overflow_table.
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        if not self.connected:
+            raise RuntimeError(
+                "Notifier not connected. Call `connect()` before creating a function."
+            )
+        if overflow_table and outbox_table:
+            raise ValueError("overflow_table and outbox_table cannot be combined")
+
+        try:
+            query = create_trigger_function_query(
+                function_name,
+                channel,
+                overflow_table,
+                max_payload_size,
+                columns,
+                diff,
+                key_columns,
+                outbox_table,
+            )
+            async with self.acquire() as conn:
+                await conn.execute(query)
+            self.clear_catalog_cache()
+        except Exception as e:
+            raise Exception(f"Error creating trigger function {function_name}: {e}")
+
+    async def create_statement_trigger_function(
+        self,
+        function_name: str,
+        channel: str,
+        chunk_size: int = 100,
+        summary_key: str = None,
+        overflow_table: str = None,
+        max_payload_size: int = MAX_NOTIFY_PAYLOAD_SIZE,
+        outbox_table: str = None,
+    ):
+        """
+        Creates a PostgreSQL notification function for statement-level triggers.
+
+        The function reads the rows affected by a statement from the trigger's
+        transition tables and sends them in chunks of at most `chunk_size` rows, each as
+        {"trigger", "timing", "event", "table", "chunk", "rows"}. A chunk is also closed
+        before it would exceed max_payload_size bytes, so only a single row larger than
+        that can produce a bigger message; use overflow_table for such rows. If summary_key is
+        given, a single {"trigger", "timing", "event", "table", "count", "min_key",
+        "max_key"} message describing the affected key range is sent instead.
+        Statements that affect no rows are not notified. Attach it with
+        `create_trigger(..., level="STATEMENT")`.
+
+        Args:
+            function_name (str): The name of the trigger function to create.
+            channel (str): The notification channel to send messages to.
+            chunk_size (int, optional): The maximum number of rows per notification.
+                Defaults to 100.
+            summary_key (str, optional): The column whose range is reported in summary mode.
+            overflow_table (str, optional): A table created with `create_overflow_table` that
+                stores messages larger than max_payload_size bytes.
+            max_payload_size (int, optional): The largest payload, in bytes, sent inline,
+                which also caps the size of chunks. Defaults to 7999, just below the
+                NOTIFY limit.
+            outbox_table (str, optional): An outbox table created with `create_outbox_table`
+                to append the messages to. Cannot be combined with overflow_table.
 
         Raises:
             RuntimeError: If the connection to PostgreSQL is not established.
+            ValueError: If chunk_size is not a positive integer or both tables are given.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError(
                 "Notifier not connected. Call `connect()` before creating a function."
             )
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        if overflow_table and outbox_table:
+            raise ValueError("overflow_table and outbox_table cannot be combined")
 
         try:
-            query = create_trigger_function_query(function_name, channel)
-            await self.conn.execute(query)
+            query = create_statement_trigger_function_query(
+                function_name,
+                channel,
+                chunk_size,
+                summary_key,
+                overflow_table,
+                max_payload_size,
+                outbox_table,
+            )
+            async with self.acquire() as conn:
+                await conn.execute(query)
+            self.clear_catalog_cache()
         except Exception as e:
             raise Exception(f"Error creating trigger function {function_name}: {e}")
 
+    async def create_overflow_table(self, table_name: str = "pg_notify_overflow"):
+        """
+        Creates the table that stores trigger payloads too large for NOTIFY.
+
+        Args:
+            table_name (str, optional): The name of the overflow table. Defaults to "pg_notify_overflow".
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        try:
+            async with self.acquire() as conn:
+                await conn.execute(create_overflow_table_query(table_name))
+        except Exception as e:
+            raise Exception(f"Error creating overflow table {table_name}: {e}")
+
+    async def purge_overflow_payloads(
+        self, table_name: str = "pg_notify_overflow", older_than: float = 3600
+    ):
+        """
+        Deletes stored overflow payloads that listeners no longer need.
+
+        Args:
+            table_name (str, optional): The name of the overflow table. Defaults to "pg_notify_overflow".
+            older_than (float, optional): The minimum age, in seconds, of the rows to delete. Defaults to 3600.
+
+        Returns:
+            str: The status of the DELETE command.
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        try:
+            async with self.acquire() as conn:
+                return await conn.execute(
+                    purge_overflow_payloads_query(table_name), float(older_than)
+                )
+        except Exception as e:
+            raise Exception(f"Error purging overflow table {table_name}: {e}")
+
+    async def create_outbox_table(self, table_name: str = "pg_notify_outbox"):
+        """
+        Creates the outbox table used for durable notifications, with its offsets table.
+
+        Args:
+            table_name (str, optional): The name of the outbox table. Defaults to "pg_notify_outbox".
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        try:
+            async with self.acquire() as conn:
+                await conn.execute(create_outbox_table_query(table_name))
+        except Exception as e:
+            raise Exception(f"Error creating outbox table {table_name}: {e}")
+
+    async def purge_outbox(
+        self, table_name: str = "pg_notify_outbox", older_than: float = 86400
+    ):
+        """
+        Deletes outbox rows older than the given age, which every consumer must have read.
+
+        Args:
+            table_name (str, optional): The name of the outbox table. Defaults to "pg_notify_outbox".
+            older_than (float, optional): The minimum age, in seconds, of the rows to delete. Defaults to 86400.
+
+        Returns:
+            str: The status of the DELETE command.
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        try:
+            async with self.acquire() as conn:
+                return await conn.execute(purge_outbox_query(table_name), float(older_than))
+        except Exception as e:
+            raise Exception(f"Error purging outbox table {table_name}: {e}")
+
     async def get_trigger_functions(self, table_name: str, trigger_name: str = None):
         """
         Retrieves the trigger functions associated with a specific table and trigger.
 
         Args:
             table_name (str): The name of the table whose trigger functions to retrieve.
+                Unqualified names match the table name exactly, case included, and are
+                resolved through the search path. Schema-qualified names are parsed as
+                SQL identifiers, so mixed-case parts must be quoted.
             trigger_name (str, optional): The name of a specific trigger. If None, all trigger functions for the table are returned.
 
         Returns:
@@ -93,23 +699,53 @@ class Notifier(PGManager):
         Raises:
             RuntimeError: If the connection to PostgreSQL is not established.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError("Notifier not connected. Call `connect()` first.")
 
+        key = (table_name, trigger_name)
+        if self.catalog_cache and key in self._functions_cache:
+            return list(self._functions_cache[key])
+
         try:
             query = GET_TRIGGER_FUNCTIONS_QUERY
             params = [table_name]
 
             if trigger_name:
-                query += " AND tgname = $2"
+                query += " AND pg_trigger.tgname = $2"
                 params.append(trigger_name)
 
-            rows = await self.conn.fetch(query, *params)
-            return [row["function_name"] for row in rows]
+            async with self.acquire() as conn:
+                rows = await conn.fetch(query, *params)
+            functions = [row["function_name"] for row in rows]
         except Exception as e:
             raise Exception(
                 f"Error retrieving trigger functions for table {table_name}: {e}"
             )
+        if self.catalog_cache:
+            self._functions_cache[key] = list(functions)
+        return functions
+
+    async def get_trigger_functions_many(self, table_names: Iterable[str]):
+        """
+        Retrieves the trigger functions of many tables with a single query.
+
+        Args:
+            table_names (Iterable[str]): The names of the tables, optionally schema-qualified.
+
+        Returns:
+            dict: The list of trigger function names of each table, keyed by table name.
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        return await self._fetch_many(
+            table_names,
+            GET_TRIGGER_FUNCTIONS_MANY_QUERY,
+            "function_name",
+            self._functions_cache,
+            lambda table_name: (table_name, None),
+            "trigger functions",
+        )
 
     async def remove_trigger_function(self, function_name: str):
         """
@@ -124,12 +760,14 @@ class Notifier(PGManager):
         Raises:
             RuntimeError: If the connection to PostgreSQL is not established.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError("Notifier not connected. Call `connect()` first.")
 
         try:
             query = drop_function_query(function_name)
-            await self.conn.execute(query)
+            async with self.acquire() as conn:
+                await conn.execute(query)
+            self.clear_catalog_cache()
             return {"function_name": function_name, "success": True}
         except Exception as e:
             raise Exception(f"Error removing trigger function {function_name}: {e}")
@@ -141,6 +779,7 @@ class Notifier(PGManager):
         function_name: str,
         event: str,
         timing: str = "AFTER",
+        level: str = "ROW",
     ):
         """
         Creates a PostgreSQL trigger for the specified table.
@@ -151,35 +790,179 @@ class Notifier(PGManager):
             function_name (str): The name of the function to be executed when the trigger fires.
             event (str): The event that fires the trigger (e.g., 'INSERT', 'UPDATE', 'DELETE').
             timing (str, optional): The timing of the trigger ('BEFORE' or 'AFTER'). Defaults to "AFTER".
+            level (str, optional): 'ROW' to fire once per row, or 'STATEMENT' to fire once per
+                statement with the affected rows exposed as transition tables, for functions
+                created with `create_statement_trigger_function`. Defaults to "ROW".
 
         Raises:
             RuntimeError: If the connection to PostgreSQL is not established.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError(
                 "Notifier not connected. Call `connect()` before creating a trigger."
             )
-        if event not in ["INSERT", "UPDATE", "DELETE"]:
-            raise ValueError("event value must be either INSERT', 'UPDATE' or 'DELETE'")
-        if timing not in ["BEFORE", "AFTER"]:
-            raise ValueError("timing value must be either 'BEFORE' or 'AFTER'")
+        _validate_trigger(event, timing, level)
 
         try:
             query = create_trigger_query(
-                table_name, trigger_name, function_name, event, timing
+                table_name, trigger_name, function_name, event, timing, level
             )
-            await self.conn.execute(query)
+            async with self.acquire() as conn:
+                await conn.execute(query)
+            self.clear_catalog_cache()
         except Exception as e:
             raise Exception(
                 f"Error creating trigger {trigger_name} for table {table_name}: {e}"
             )
 
+    async def provision(self, specs: Iterable[Mapping], dry_run: bool = False):
+        """
+        Creates or replaces the notification functions and triggers of many tables at once.
+
+        Each spec is a mapping with the `create_trigger` arguments "table_name",
+        "trigger_name", "function_name", "event" and optionally "timing" and "level",
+        plus "channel" and any other argument of `create_trigger_function` (or of
+        `create_statement_trigger_function` for STATEMENT level). Several specs may
+        share a function.
+
+        The existing functions and triggers are read from the catalog and compared with
+        the specs, and only functions whose body differs and triggers whose table,
+        function, event, timing or level differ are (re)created, in one transaction
+        and a single script. The number of round trips does not depend on the number
+        of specs.
+
+        Args:
+            specs (Iterable[Mapping]): The functions and triggers to provision.
+            dry_run (bool, optional): If True, the changes are computed but not applied.
+                Defaults to False.
+
+        Returns:
+            dict: The "functions" (names) and "triggers" ((table_name, trigger_name) pairs)
+                that were, or with dry_run would be, created or replaced.
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+            ValueError: If a spec is invalid, or specs conflict with each other.
+            Exception: If there is an error while reading the catalog or applying the changes.
+        """
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        functions = {}
+        triggers = {}
+        for spec in specs:
+            function_name, function_query, trigger = self._provision_spec(spec)
+            if functions.setdefault(function_name, function_query) != function_query:
+                raise ValueError(f"Conflicting definitions for function {function_name}")
+            if (trigger["table_name"], trigger["trigger_name"]) in triggers:
+                raise ValueError(
+                    f"Duplicate trigger {trigger['trigger_name']} on table {trigger['table_name']}"
+                )
+            triggers[(trigger["table_name"], trigger["trigger_name"])] = trigger
+
+        try:
+            async with self.acquire() as conn:
+                async with conn.transaction():
+                    existing_functions = await conn.fetch(
+                        GET_FUNCTION_SOURCES_QUERY, list(functions)
+                    )
+                    existing_triggers = await conn.fetch(
+                        GET_TRIGGER_DEFINITIONS_QUERY,
+                        [table_name for table_name, _ in triggers],
+                        [trigger_name for _, trigger_name in triggers],
+                        [t["function_name"] for t in triggers.values()],
+                    )
+
+                    sources = {
+                        row["function_name"]: row["source"] for row in existing_functions
+                    }
+                    changed_functions = [
+                        name
+                        for name, query in functions.items()
+                        if sources.get(name) != function_source(query)
+                    ]
+                    definitions = {
+                        (row["table_name"], row["trigger_name"]): row
+                        for row in existing_triggers
+                    }
+                    changed_triggers = [
+                        key
+                        for key, trigger in triggers.items()
+                        if not self._trigger_matches(trigger, definitions.get(key))
+                    ]
+
+                    statements = [functions[name] for name in changed_functions]
+                    for key in changed_triggers:
+                        trigger = triggers[key]
+                        if key in definitions:
+                            statements.append(
+                                drop_trigger_query(trigger["trigger_name"], trigger["table_name"])
+                            )
+                        statements.append(create_trigger_query(**trigger))
+                    if statements and not dry_run:
+                        await conn.execute("\n".join(statements))
+            if statements and not dry_run:
+                self.clear_catalog_cache()
+        except Exception as e:
+            raise Exception(f"Error provisioning triggers: {e}")
+
+        return {"functions": changed_functions, "triggers": changed_triggers}
+
+    @staticmethod
+    def _provision_spec(spec):
+        missing = {"table_name", "trigger_name", "function_name", "channel", "event"} - set(spec)
+        if missing:
+            raise ValueError(f"Trigger spec is missing {', '.join(sorted(missing))}")
+        level = spec.get("level", "ROW")
+        timing = spec.get("timing", "AFTER")
+        _validate_trigger(spec["event"], timing, level)
+
+        options = {k: v for k, v in spec.items() if k not in _TRIGGER_SPEC_KEYS}
+        unknown = set(options) - _FUNCTION_SPEC_KEYS[level]
+        if unknown:
+            raise ValueError(f"Unknown trigger spec keys: {', '.join(sorted(unknown))}")
+        if options.get("overflow_table") and options.get("outbox_table"):
+            raise ValueError("overflow_table and outbox_table cannot be combined")
+        if options.get("chunk_size", 1) < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        if level == "STATEMENT":
+            query = create_statement_trigger_function_query(
+                spec["function_name"], spec["channel"], **options
+            )
+        else:
+            query = create_trigger_function_query(
+                spec["function_name"], spec["channel"], **options
+            )
+        trigger = {
+            "table_name": spec["table_name"],
+            "trigger_name": spec["trigger_name"],
+            "function_name": spec["function_name"],
+            "event": spec["event"],
+            "timing": timing,
+            "level": level,
+        }
+        return spec["function_name"], query, trigger
+
+    @staticmethod
+    def _trigger_matches(trigger, row):
+        if row is None or not row["same_function"]:
+            return False
+        event, level = trigger["event"], trigger["level"]
+        return row["trigger_type"] == trigger_type(event, trigger["timing"], level) and (
+            row["old_table"],
+            row["new_table"],
+        ) == trigger_transition_tables(event, level)
+
     async def get_triggers(self, table_name: str):
         """
         Retrieves all triggers associated with a specific table.
 
         Args:
             table_name (str): The name of the table whose triggers to retrieve.
+                Unqualified names match the table name exactly, case included, and are
+                resolved through the search path. Schema-qualified names are parsed as
+                SQL identifiers, so mixed-case parts must be quoted.
 
         Returns:
             list: A list of trigger names associated with the specified table.
@@ -187,15 +970,81 @@ class Notifier(PGManager):
         Raises:
             RuntimeError: If the connection to PostgreSQL is not established.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError("Notifier not connected. Call `connect()` first.")
 
+        if self.catalog_cache and table_name in self._triggers_cache:
+            return list(self._triggers_cache[table_name])
+
         try:
             query = GET_TRIGGERS_QUERY
-            rows = await self.conn.fetch(query, table_name)
-            return [row["trigger_name"] for row in rows]
+            async with self.acquire() as conn:
+                rows = await conn.fetch(query, table_name)
+            triggers = [row["trigger_name"] for row in rows]
         except Exception as e:
             raise Exception(f"Error retrieving triggers for table {table_name}: {e}")
+        if self.catalog_cache:
+            self._triggers_cache[table_name] = list(triggers)
+        return triggers
+
+    async def get_triggers_many(self, table_names: Iterable[str]):
+        """
+        Retrieves the triggers of many tables with a single query.
+
+        Args:
+            table_names (Iterable[str]): The names of the tables, optionally schema-qualified.
+
+        Returns:
+            dict: The list of trigger names of each table, keyed by table name.
+
+        Raises:
+            RuntimeError: If the connection to PostgreSQL is not established.
+        """
+        return await self._fetch_many(
+            table_names,
+            GET_TRIGGERS_MANY_QUERY,
+            "trigger_name",
+            self._triggers_cache,
+            lambda table_name: table_name,
+            "triggers",
+        )
+
+    async def _fetch_many(self, table_names, query, column, cache, cache_key, what):
+        if not self.connected:
+            raise RuntimeError("Notifier not connected. Call `connect()` first.")
+
+        table_names = list(dict.fromkeys(table_names))
+        result = {}
+        missing = []
+        for table_name in table_names:
+            if self.catalog_cache and cache_key(table_name) in cache:
+                result[table_name] = list(cache[cache_key(table_name)])
+            else:
+                result[table_name] = []
+                missing.append(table_name)
+
+        if missing:
+            try:
+                async with self.acquire() as conn:
+                    rows = await conn.fetch(query, missing)
+            except Exception as e:
+                raise Exception(f"Error retrieving {what} for tables: {e}")
+            for row in rows:
+                result[row["table_name"]].append(row[column])
+            if self.catalog_cache:
+                for table_name in missing:
+                    cache[cache_key(table_name)] = list(result[table_name])
+        return result
+
+    def clear_catalog_cache(self):
+        """
+        Discards the cached results of the trigger and trigger function lookups.
+
+        Call it after changing triggers without this Notifier, for example through
+        `execute` or from another process.
+        """
+        self._triggers_cache = {}
+        self._functions_cache = {}
 
     async def remove_trigger(self, table_name: str, trigger_name: str):
         """
@@ -212,12 +1061,14 @@ class Notifier(PGManager):
             RuntimeError: If the connection to PostgreSQL is not established.
 
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError("Notifier not connected. Call `connect()` first.")
 
         try:
             query = drop_trigger_query(trigger_name, table_name)
-            await self.conn.execute(query)
+            async with self.acquire() as conn:
+                await conn.execute(query)
+            self.clear_catalog_cache()
             return {"trigger_name": trigger_name, "success": True}
         except Exception as e:
             raise Exception(
@@ -0,0 +1,156 @@
+"""
+Module to consume durable notifications appended to an outbox table.
+"""
+
+import asyncio
+from typing import Callable, Tuple
+from .dispatcher import report_callback_error
+from .utils import (
+    fetch_outbox_query,
+    load_outbox_offset_query,
+    save_outbox_offset_query,
+)
+
+
+class OutboxSubscription:
+    """
+    Delivers the rows an outbox table holds for one channel, in order and at least once.
+
+    The subscription keeps a high-watermark, the (txid, id) position of the last row
+    delivered, and catches up by reading the rows after it in keyset-paginated
+    pages. A catch-up runs when the subscription starts, on every NOTIFY wake-up,
+    every `poll_interval` seconds and after a reconnect; wake-ups arriving during a
+    catch-up are coalesced into a single follow-up read. With a `consumer` name the
+    watermark is stored in the outbox's offsets table after each page, so a
+    restarted consumer resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        callback: Callable,
+        fetch: Callable,
+        outbox_table: str,
+        consumer: str = None,
+        after: Tuple[int, int] = None,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Initializes the OutboxSubscription class.
+
+        Args:
+            channel (str): The channel whose rows are delivered.
+            callback (callable): An async function called with the payload of each row.
+            fetch (callable): An async function running a query on the listener connection,
+                called as `fetch(query, *args)`.
+            outbox_table (str): The outbox table created with `Notifier.create_outbox_table`.
+            consumer (str, optional): The name under which the watermark is persisted.
+            after (Tuple[int, int], optional): The (txid, id) position to start after when no
+                persisted watermark exists. Defaults to the start of the outbox.
+            batch_size (int, optional): The number of rows read per page. Defaults to 500.
+            poll_interval (float, optional): Seconds between catch-ups without a wake-up.
+                Rows are only read once every older transaction has finished, so a row
+                held back at a wake-up is read by the next poll, at most this long after
+                the older transactions finish. Defaults to 1. None disables polling.
+
+        Raises:
+            ValueError: If batch_size or poll_interval is out of range.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if poll_interval is not None and poll_interval <= 0:
+            raise ValueError("poll_interval must be positive")
+
+        self.channel = channel
+        self.callback = callback
+        self.outbox_table = outbox_table
+        self.consumer = consumer
+        self.watermark = tuple(after) if after else (0, 0)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._fetch = fetch
+        self._fetch_query = fetch_outbox_query(outbox_table)
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        """
+        Starts the background task that performs the catch-ups.
+        """
+        if self._task is None:
+            self._wakeup.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, notification):
+        """
+        Handles a wake-up NOTIFY by scheduling a catch-up.
+
+        Args:
+            notification (Notification): The wake-up notification; its payload is ignored.
+        """
+        self._wakeup.set()
+
+    def wake(self):
+        """
+        Schedules a catch-up, for example after the connection was re-established.
+        """
+        self._wakeup.set()
+
+    async def stop(self):
+        """
+        Cancels the background task.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loaded = self.consumer is None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                if not loaded:
+                    await self._load_watermark()
+                    loaded = True
+                await self.catch_up()
+            except Exception as e:
+                # Retried on the next wake-up, poll or reconnect
+                report_callback_error(e)
+
+    async def catch_up(self):
+        """
+        Delivers every row after the watermark, one page at a time.
+        """
+        while True:
+            txid, row_id = self.watermark
+            rows = await self._fetch(
+                self._fetch_query, self.channel, txid, row_id, self.batch_size
+            )
+            try:
+                for row in rows:
+                    await self.callback(row["payload"])
+                    self.watermark = (row["txid"], row["id"])
+            finally:
+                if self.consumer is not None and self.watermark != (txid, row_id):
+                    await self._fetch(
+                        save_outbox_offset_query(self.outbox_table),
+                        self.consumer,
+                        self.channel,
+                        *self.watermark,
+                    )
+            if len(rows) < self.batch_size:
+                return
+
+    async def _load_watermark(self):
+        rows = await self._fetch(
+            load_outbox_offset_query(self.outbox_table), self.consumer, self.channel
+        )
+        if rows:
+            self.watermark = (rows[0]["txid"], rows[0]["id"])
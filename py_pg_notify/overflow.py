@@ -0,0 +1,96 @@
+"""
+Module to resolve trigger notifications whose payload was stored in an overflow table.
+"""
+
+import asyncio
+import json
+from .utils import OVERFLOW_REFERENCE_KEY, fetch_overflow_payloads_query
+
+_REFERENCE_PREFIX = f'{{"{OVERFLOW_REFERENCE_KEY}"'
+
+
+def overflow_reference(payload: str):
+    """
+    Returns the overflow row id referenced by a payload, or None for regular payloads.
+
+    Args:
+        payload (str): The notification payload.
+    """
+    if not payload.startswith(_REFERENCE_PREFIX):
+        return None
+    try:
+        return int(json.loads(payload)[OVERFLOW_REFERENCE_KEY])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class OverflowResolver:
+    """
+    Replaces overflow references with the payloads stored in an overflow table.
+
+    References that arrive while a lookup is in flight are collected and resolved
+    together by the next lookup, so a burst of large rows costs one query per
+    batch rather than one per notification.
+    """
+
+    def __init__(self, table_name: str, lock: asyncio.Lock = None):
+        """
+        Initializes the OverflowResolver class.
+
+        Args:
+            table_name (str): The overflow table written by the trigger functions.
+            lock (asyncio.Lock, optional): A lock serializing queries on the connection,
+                shared with its other users. Defaults to a private lock.
+        """
+        self.table_name = table_name
+        self._query = fetch_overflow_payloads_query(table_name)
+        self._pending = {}
+        self._lock = lock or asyncio.Lock()
+
+    async def resolve(self, connection, payload: str):
+        """
+        Resolves a payload, returning it unchanged if it is not an overflow reference.
+
+        Args:
+            connection: The connection used to read the overflow table.
+            payload (str): The notification payload.
+
+        Returns:
+            str: The original payload.
+
+        Raises:
+            KeyError: If the referenced row no longer exists.
+        """
+        payload_id = overflow_reference(payload)
+        if payload_id is None:
+            return payload
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(payload_id, []).append(future)
+
+        async with self._lock:
+            if not future.done():
+                await self._resolve_pending(connection)
+        return await future
+
+    async def _resolve_pending(self, connection):
+        waiters, self._pending = self._pending, {}
+        try:
+            rows = await connection.fetch(self._query, list(waiters))
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        payloads = {row["id"]: row["payload"] for row in rows}
+        for payload_id, futures in waiters.items():
+            for future in futures:
+                if payload_id in payloads:
+                    future.set_result(payloads[payload_id])
+                else:
+                    future.set_exception(
+                        KeyError(
+                            f"Overflow payload {payload_id} not found in table '{self.table_name}'."
+                        )
+                    )
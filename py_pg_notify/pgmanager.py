@@ -1,5 +1,6 @@
 import os
 import re
+from contextlib import asynccontextmanager
 import asyncpg
 
 
@@ -15,6 +16,7 @@ class PGConfig:
 
     Usage:
         config = PGConfig(user="myuser", password="mypassword", dbname="mydb")
+        pooled = PGConfig(dsn, use_pool=True, pool_min_size=2, pool_max_size=20)
     """
 
     def __init__(
@@ -26,6 +28,11 @@ class PGConfig:
         host: str = None,
         port: int = None,
         dbname: str = None,
+        use_pool: bool = False,
+        pool_min_size: int = None,
+        pool_max_size: int = None,
+        pool_acquire_timeout: float = None,
+        statement_cache_size: int = None,
     ):
         """
         Initializes the PGConfig class.
@@ -37,6 +44,13 @@ class PGConfig:
             host (str, optional): The database host.
             port (int, optional): The database port.
             dbname (str, optional): The database name.
+            use_pool (bool, optional): If True, managers open a connection pool instead of
+                a single connection. Defaults to False.
+            pool_min_size (int, optional): The number of connections the pool keeps open.
+            pool_max_size (int, optional): The maximum number of connections in the pool.
+            pool_acquire_timeout (float, optional): Seconds to wait for a free pooled connection.
+            statement_cache_size (int, optional): The size of the prepared statement cache
+                kept by each connection.
 
         Priority of parameter resolution:
         1. Explicit parameters passed to this class.
@@ -49,6 +63,14 @@ class PGConfig:
             port or os.getenv("PG_PORT", 5432),
             dbname or os.getenv("PG_DBNAME"),
         )
+        if pool_min_size is not None and pool_max_size is not None:
+            if pool_min_size > pool_max_size:
+                raise ValueError("`pool_min_size` must not exceed `pool_max_size`.")
+        self.use_pool = use_pool
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_acquire_timeout = pool_acquire_timeout
+        self.statement_cache_size = statement_cache_size
 
     def _generate_dsn(self, user, password, host, port, dbname):
         if not all([user, password, dbname]):
@@ -64,6 +86,7 @@ class PGManager:
 
     Features:
         - Handles connection setup and teardown.
+        - Uses either a single connection or a connection pool, as selected by PGConfig.
         - Provides utility methods for executing queries.
         - Designed to be extended by specific classes (e.g., Listener, Notifier).
     """
@@ -75,22 +98,68 @@ class PGManager:
         Args:
             config (PGConfig): An instance of PGConfig containing connection parameters.
         """
+        self.config = config
         self.dsn = config.dsn
         self.conn = None
+        self.pool = None
+
+    @property
+    def connected(self):
+        """
+        bool: True if a connection or a connection pool is open.
+        """
+        return self.conn is not None or self.pool is not None
+
+    def _connect_kwargs(self):
+        kwargs = {}
+        if self.config.statement_cache_size is not None:
+            kwargs["statement_cache_size"] = self.config.statement_cache_size
+        return kwargs
 
     async def connect(self):
         """
-        Establishes a connection to the PostgreSQL database.
+        Establishes a connection, or a connection pool, to the PostgreSQL database.
 
         Raises:
             asyncpg.exceptions.PostgresError: If the connection to the PostgreSQL database fails.
         """
         try:
-            if self.conn is None:
-                self.conn = await asyncpg.connect(self.dsn)
+            if self.connected:
+                return
+            if self.config.use_pool:
+                kwargs = self._connect_kwargs()
+                if self.config.pool_min_size is not None:
+                    kwargs["min_size"] = self.config.pool_min_size
+                if self.config.pool_max_size is not None:
+                    kwargs["max_size"] = self.config.pool_max_size
+                self.pool = await asyncpg.create_pool(self.dsn, **kwargs)
+            else:
+                self.conn = await asyncpg.connect(self.dsn, **self._connect_kwargs())
         except asyncpg.exceptions.PostgresError as e:
             raise RuntimeError(f"Failed to connect to the PostgreSQL database: {e}")
 
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Provides a connection for the duration of an `async with` block.
+
+        In pooled mode a connection is borrowed from the pool, waiting at most
+        `pool_acquire_timeout` seconds, and released when the block exits.
+        Otherwise the single managed connection is yielded.
+
+        Raises:
+            RuntimeError: If the connection is not established.
+        """
+        if self.pool is not None:
+            async with self.pool.acquire(
+                timeout=self.config.pool_acquire_timeout
+            ) as conn:
+                yield conn
+        elif self.conn is not None:
+            yield self.conn
+        else:
+            raise RuntimeError("Connection not established. Call `connect()` first.")
+
     async def execute(self, query: str, *args):
         """
         Executes a SQL query on the PostgreSQL database.
@@ -106,23 +175,27 @@ class PGManager:
             RuntimeError: If the connection is not established.
             asyncpg.exceptions.PostgresError: If the query execution fails.
         """
-        if self.conn is None:
+        if not self.connected:
             raise RuntimeError("Connection not established. Call `connect()` first.")
         try:
-            if bool(re.match(r"^\s*SELECT\b", query, re.IGNORECASE)):
-                return await self.conn.fetch(query, *args)
-            return await self.conn.execute(query, *args)
+            async with self.acquire() as conn:
+                if bool(re.match(r"^\s*SELECT\b", query, re.IGNORECASE)):
+                    return await conn.fetch(query, *args)
+                return await conn.execute(query, *args)
         except asyncpg.exceptions.PostgresError as e:
             raise RuntimeError(f"Failed to execute query: {e}")
 
     async def close(self):
         """
-        Closes the connection to the PostgreSQL database.
+        Closes the connection, or the connection pool, to the PostgreSQL database.
 
         Raises:
             asyncpg.exceptions.PostgresError: If closing the connection fails.
         """
         try:
+            if self.pool:
+                await self.pool.close()
+                self.pool = None
             if self.conn:
                 await self.conn.close()
                 self.conn = None
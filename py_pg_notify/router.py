@@ -0,0 +1,133 @@
+"""
+Module to route channel names to handlers subscribed with wildcard patterns.
+"""
+
+from typing import Callable
+
+SEGMENT_SEPARATOR = "."
+
+# Matches exactly one segment
+SINGLE_WILDCARD = "*"
+
+# Matches any number of trailing segments, including none
+MULTI_WILDCARD = "**"
+
+
+class _Node:
+    __slots__ = ("children", "handlers", "tail_handlers")
+
+    def __init__(self):
+        self.children = {}
+        self.handlers = []
+        self.tail_handlers = []
+
+
+class Router:
+    """
+    Matches channel names against subscription patterns using a segment trie.
+
+    Channels and patterns are split on "." into segments. In a pattern, "*" matches
+    exactly one segment and a final "**" matches all remaining segments, so
+    "orders.eu.*" matches "orders.eu.123" and "orders.**" matches every channel
+    starting with "orders.". Matching walks the trie once per segment, so its cost
+    depends on the channel length rather than on the number of subscriptions, and
+    results are cached per channel until the subscriptions change.
+    """
+
+    def __init__(self):
+        """
+        Initializes the Router class with no subscriptions.
+        """
+        self._root = _Node()
+        self._cache = {}
+        self.patterns = {}
+
+    @staticmethod
+    def validate(pattern: str):
+        """
+        Raises a ValueError if the pattern is malformed.
+
+        Args:
+            pattern (str): The pattern to check.
+        """
+        segments = pattern.split(SEGMENT_SEPARATOR)
+        if not pattern or "" in segments:
+            raise ValueError(f"Invalid pattern '{pattern}': empty segment.")
+        if MULTI_WILDCARD in segments[:-1]:
+            raise ValueError(
+                f"Invalid pattern '{pattern}': '{MULTI_WILDCARD}' must be the last segment."
+            )
+
+    def add(self, pattern: str, handler: Callable):
+        """
+        Subscribes a handler to a pattern.
+
+        Args:
+            pattern (str): The channel pattern.
+            handler (callable): The handler to return for matching channels.
+
+        Raises:
+            ValueError: If the pattern is malformed.
+        """
+        self.validate(pattern)
+        *segments, last = pattern.split(SEGMENT_SEPARATOR)
+        node = self._root
+        for segment in segments:
+            node = node.children.setdefault(segment, _Node())
+        if last == MULTI_WILDCARD:
+            node.tail_handlers.append(handler)
+        else:
+            node.children.setdefault(last, _Node()).handlers.append(handler)
+        self.patterns.setdefault(pattern, []).append(handler)
+        self._cache.clear()
+
+    def remove(self, pattern: str):
+        """
+        Unsubscribes every handler from a pattern.
+
+        Args:
+            pattern (str): The channel pattern.
+
+        Raises:
+            KeyError: If nothing is subscribed to the pattern.
+        """
+        if pattern not in self.patterns:
+            raise KeyError(f"No listener found for pattern '{pattern}'.")
+        del self.patterns[pattern]
+
+        # Rebuilding keeps the trie free of empty branches
+        self._root = _Node()
+        patterns, self.patterns = self.patterns, {}
+        for remaining, handlers in patterns.items():
+            for handler in handlers:
+                self.add(remaining, handler)
+        self._cache.clear()
+
+    def match(self, channel: str):
+        """
+        Returns the handlers whose patterns match a channel.
+
+        Args:
+            channel (str): The channel name.
+
+        Returns:
+            list: The matching handlers, in pattern order for each trie path.
+        """
+        handlers = self._cache.get(channel)
+        if handlers is None:
+            handlers = []
+            self._match(self._root, channel.split(SEGMENT_SEPARATOR), 0, handlers)
+            self._cache[channel] = handlers
+        return handlers
+
+    def _match(self, node, segments, index, handlers):
+        handlers.extend(node.tail_handlers)
+        if index == len(segments):
+            handlers.extend(node.handlers)
+            return
+        segment = segments[index]
+        keys = (segment,) if segment == SINGLE_WILDCARD else (segment, SINGLE_WILDCARD)
+        for key in keys:
+            child = node.children.get(key)
+            if child is not None:
+                self._match(child, segments, index + 1, handlers)
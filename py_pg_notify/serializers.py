@@ -0,0 +1,188 @@
+"""
+Module to serialize structured notification payloads to text and back.
+"""
+
+import base64
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Union
+from .decoders import DEFAULT_JSON_DECODER
+
+# Starts an enveloped payload, followed by the serializer name and ":"
+SERIALIZER_MARK = "\x1c"
+
+
+class Serializer(ABC):
+    """
+    Converts payload objects to NOTIFY text and back.
+
+    Subclasses set `name` and implement `dumps` and `loads`. Serializers whose
+    output is JSON are sent as is, so any consumer can read them. Others set
+    `envelope`, and their output is prefixed with a header naming the serializer,
+    which tells the Listener how to decode it.
+    """
+
+    name = None
+    envelope = False
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        """
+        Returns the text form of an object.
+        """
+
+    @abstractmethod
+    def loads(self, text: str) -> Any:
+        """
+        Returns the object encoded in a text produced by `dumps`.
+        """
+
+
+class JSONSerializer(Serializer):
+    """
+    Serializes payloads as JSON with the standard library.
+    """
+
+    name = "json"
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"))
+
+    def loads(self, text):
+        return DEFAULT_JSON_DECODER(text)
+
+
+class OrjsonSerializer(Serializer):
+    """
+    Serializes payloads as JSON with orjson.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """
+        Raises:
+            ImportError: If orjson is not installed.
+        """
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError(
+                "The orjson serializer requires the 'orjson' package: pip install py-pg-notify[fast]"
+            )
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj).decode()
+
+    def loads(self, text):
+        return self._orjson.loads(text)
+
+    def __reduce__(self):
+        return (OrjsonSerializer, ())
+
+
+class MsgpackSerializer(Serializer):
+    """
+    Serializes payloads as base64-encoded MessagePack.
+    """
+
+    name = "msgpack"
+    envelope = True
+
+    def __init__(self):
+        """
+        Raises:
+            ImportError: If msgpack is not installed.
+        """
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError(
+                "The msgpack serializer requires the 'msgpack' package: pip install py-pg-notify[msgpack]"
+            )
+        self._msgpack = msgpack
+
+    def dumps(self, obj):
+        return base64.b64encode(self._msgpack.packb(obj)).decode("ascii")
+
+    def loads(self, text):
+        return self._msgpack.unpackb(base64.b64decode(text))
+
+    def __reduce__(self):
+        return (MsgpackSerializer, ())
+
+
+SERIALIZERS = {
+    JSONSerializer.name: JSONSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def get_serializer(serializer: Union[str, Serializer]) -> Serializer:
+    """
+    Returns a serializer instance given one or the name of a built-in serializer.
+
+    Args:
+        serializer (Union[str, Serializer]): "json", "orjson", "msgpack" or an instance.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the serializer's package is not installed.
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+    if serializer not in SERIALIZERS:
+        raise ValueError(
+            f"serializer must be one of {', '.join(repr(s) for s in SERIALIZERS)}"
+        )
+    return SERIALIZERS[serializer]()
+
+
+def serialize(serializer: Serializer, obj: Any) -> str:
+    """
+    Returns the payload text of an object, with an envelope header if the serializer needs one.
+
+    Strings are returned unchanged, so plain text payloads can still be sent.
+
+    Args:
+        serializer (Serializer): The serializer to use.
+        obj (Any): The payload object.
+    """
+    if isinstance(obj, str):
+        return obj
+    text = serializer.dumps(obj)
+    if serializer.envelope:
+        return f"{SERIALIZER_MARK}{serializer.name}:{text}"
+    return text
+
+
+class PayloadDecoder:
+    """
+    Decodes payloads, using the serializer named in the envelope header if there is one.
+
+    Payloads without a header are decoded with the JSON decoder.
+    """
+
+    def __init__(self, json_decoder: Callable = None, serializers: Iterable[Serializer] = ()):
+        """
+        Initializes the PayloadDecoder class.
+
+        Args:
+            json_decoder (callable, optional): The decoder of payloads without a header.
+                Defaults to orjson or msgspec when installed, otherwise `json.loads`.
+            serializers (Iterable[Serializer], optional): Serializers to use for headers
+                naming them, in addition to the built-in serializers.
+        """
+        self.json_decoder = json_decoder or DEFAULT_JSON_DECODER
+        self.serializers = {serializer.name: serializer for serializer in serializers}
+
+    def __call__(self, payload: str):
+        if not payload.startswith(SERIALIZER_MARK):
+            return self.json_decoder(payload)
+        name, _, text = payload[1:].partition(":")
+        serializer = self.serializers.get(name)
+        if serializer is None:
+            serializer = self.serializers[name] = get_serializer(name)
+        return serializer.loads(text)
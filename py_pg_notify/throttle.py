@@ -0,0 +1,117 @@
+"""
+Module to slow down or reject publishing while the server's notification queue fills up.
+"""
+
+import asyncio
+import time
+from typing import Callable
+
+
+class QueueThrottle:
+    """
+    Applies backpressure based on the usage of PostgreSQL's notification queue.
+
+    NOTIFY fails at commit once the queue, shared by every session of the server, is
+    full, which happens when listeners fall behind. The throttle samples
+    `pg_notification_queue_usage()`, the fraction of the queue in use, at most every
+    `interval` seconds on the publishing path, and admits each publish as follows:
+
+    - Below `throttle_usage` publishing is not delayed.
+    - Between `throttle_usage` and `reject_usage` publishing is delayed, linearly
+      more as usage rises, up to `max_delay` seconds.
+    - From `reject_usage` publishing is rejected with a RuntimeError.
+    """
+
+    def __init__(
+        self,
+        sample: Callable,
+        interval: float = 1.0,
+        throttle_usage: float = 0.5,
+        reject_usage: float = 0.9,
+        max_delay: float = 1.0,
+    ):
+        """
+        Initializes the QueueThrottle class.
+
+        Args:
+            sample (callable): An async function returning the current queue usage, 0 to 1.
+            interval (float, optional): The minimum seconds between samples. Defaults to 1.
+            throttle_usage (float, optional): The usage from which publishing is delayed.
+                Defaults to 0.5.
+            reject_usage (float, optional): The usage from which publishing is rejected.
+                Defaults to 0.9.
+            max_delay (float, optional): The delay, in seconds, just below reject_usage.
+                Defaults to 1.
+
+        Raises:
+            ValueError: If an argument is out of range.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if not 0 <= throttle_usage <= reject_usage <= 1:
+            raise ValueError("thresholds must satisfy 0 <= throttle_usage <= reject_usage <= 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+
+        self.interval = interval
+        self.throttle_usage = throttle_usage
+        self.reject_usage = reject_usage
+        self.max_delay = max_delay
+        self.usage = 0.0
+        self._sample = sample
+        self._sampled_at = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        """
+        Samples the queue usage if the last sample is older than `interval`.
+
+        Returns:
+            float: The queue usage.
+        """
+        if self._stale():
+            async with self._lock:
+                # Concurrent callers share the sample taken by the first one
+                if self._stale():
+                    self.usage = float(await self._sample())
+                    self._sampled_at = time.monotonic()
+        return self.usage
+
+    def delay(self, usage: float):
+        """
+        Returns the seconds a publish is delayed at the given usage.
+        """
+        if usage < self.throttle_usage:
+            return 0.0
+        span = self.reject_usage - self.throttle_usage
+        if span <= 0:
+            return self.max_delay
+        return self.max_delay * min((usage - self.throttle_usage) / span, 1.0)
+
+    async def admit(self, refresh: bool = True):
+        """
+        Waits until a publish may proceed.
+
+        Args:
+            refresh (bool, optional): If False, the last sample is used even if it is
+                older than `interval`. Defaults to True.
+
+        Returns:
+            float: The seconds the publish was delayed.
+
+        Raises:
+            RuntimeError: If the queue usage is at or above `reject_usage`.
+        """
+        usage = await self.refresh() if refresh else self.usage
+        if usage >= self.reject_usage:
+            raise RuntimeError(
+                f"Notification queue is {usage:.0%} full; notifications are rejected "
+                f"above {self.reject_usage:.0%}."
+            )
+        delay = self.delay(usage)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def _stale(self):
+        return self._sampled_at is None or time.monotonic() - self._sampled_at >= self.interval
@@ -1,12 +1,86 @@
 # Utility queries
 
 
-def notify_query(channel, payload):
-    return f"SELECT pg_notify('{channel}', '{payload}');"
+NOTIFY_QUERY = "SELECT pg_notify($1, $2);"
 
 
-def create_trigger_function_query(function_name, channel):
-    return f"""
+NOTIFY_MANY_QUERY = """
+SELECT pg_notify(channel, payload)
+FROM unnest($1::text[], $2::text[]) AS batch(channel, payload);
+"""
+
+
+NOTIFICATION_QUEUE_USAGE_QUERY = "SELECT pg_notification_queue_usage();"
+
+
+MAX_NOTIFY_PAYLOAD_SIZE = 7999
+
+OVERFLOW_REFERENCE_KEY = "overflow_id"
+
+
+def _sql_text_array(values):
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]::text[]"
+
+
+def _row_section(columns, diff, key_columns):
+    # Builds the statements that project and diff the NEW/OLD rows as jsonb
+    lines = [
+        "new_row := to_jsonb(NEW);",
+        "old_row := to_jsonb(OLD);",
+    ]
+    if columns:
+        allowed = _sql_text_array(columns)
+        lines += [
+            "SELECT jsonb_object_agg(key, value) INTO new_data",
+            f"FROM jsonb_each(new_row) WHERE key = ANY({allowed});",
+            "SELECT jsonb_object_agg(key, value) INTO old_data",
+            f"FROM jsonb_each(old_row) WHERE key = ANY({allowed});",
+        ]
+    else:
+        lines += ["new_data := new_row;", "old_data := old_row;"]
+
+    if diff:
+        if key_columns:
+            keys = [f"primary_keys := {_sql_text_array(key_columns)};"]
+        else:
+            keys = [
+                "SELECT array_agg(attname::text) INTO primary_keys",
+                "FROM pg_index",
+                "INNER JOIN pg_attribute ON attrelid = indrelid AND attnum = ANY(indkey)",
+                "WHERE indrelid = TG_RELID AND indisprimary;",
+            ]
+        lines += ["IF TG_OP = 'UPDATE' THEN"]
+        lines += ["    " + line for line in keys]
+        lines += [
+            "    SELECT jsonb_object_agg(key, value) INTO changed",
+            "    FROM jsonb_each(new_data) WHERE value IS DISTINCT FROM old_data -> key;",
+            "    IF changed IS NULL THEN",
+            "        RETURN NEW;",
+            "    END IF;",
+            "    SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) INTO old_keys",
+            "    FROM jsonb_each(old_row) WHERE key = ANY(primary_keys);",
+            "    SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) INTO new_keys",
+            "    FROM jsonb_each(new_row) WHERE key = ANY(primary_keys);",
+            "    SELECT old_keys || COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) INTO old_data",
+            "    FROM jsonb_each(old_data) WHERE changed ? key;",
+            "    new_data := new_keys || changed;",
+            "END IF;",
+        ]
+    return lines
+
+
+def create_trigger_function_query(
+    function_name,
+    channel,
+    overflow_table=None,
+    max_payload_size=MAX_NOTIFY_PAYLOAD_SIZE,
+    columns=None,
+    diff=False,
+    key_columns=None,
+    outbox_table=None,
+):
+    if overflow_table is None and outbox_table is None and not columns and not diff:
+        return f"""
     CREATE OR REPLACE FUNCTION {function_name}()
     RETURNS TRIGGER AS $$
     BEGIN
@@ -25,37 +99,401 @@ def create_trigger_function_query(function_name, channel):
     $$ LANGUAGE plpgsql;
     """
 
+    declarations = ["message TEXT;"]
+    body = []
+    new_value, old_value = "NEW", "OLD"
+
+    if overflow_table is not None:
+        declarations.append("message_id BIGINT;")
+    if columns or diff:
+        declarations += [
+            "new_row JSONB;",
+            "old_row JSONB;",
+            "new_data JSONB;",
+            "old_data JSONB;",
+        ]
+        if diff:
+            declarations += [
+                "primary_keys TEXT[];",
+                "changed JSONB;",
+                "old_keys JSONB;",
+                "new_keys JSONB;",
+            ]
+        body += _row_section(columns, diff, key_columns)
+        new_value, old_value = "new_data", "old_data"
+
+    body += [
+        "message := json_build_object(",
+        "    'trigger', TG_NAME,",
+        "    'timing', TG_WHEN,",
+        "    'event', TG_OP,",
+        f"    'new', {new_value},",
+        f"    'old', {old_value}",
+        ")::text;",
+    ]
+    body += _notify_section(channel, overflow_table, max_payload_size, outbox_table)
+    body += ["RETURN NEW;"]
+    return _plpgsql_function(function_name, declarations, body)
+
+
+def _notify_section(channel, overflow_table, max_payload_size, outbox_table=None):
+    # Sends `message`, storing it in the overflow table first if it is too large.
+    # In outbox mode the message is appended to the outbox and NOTIFY only wakes listeners.
+    if outbox_table is not None:
+        return [
+            f"INSERT INTO {outbox_table} (channel, payload) VALUES ('{channel}', message);",
+            f"PERFORM pg_notify('{channel}', '');",
+        ]
+    lines = []
+    if overflow_table is not None:
+        lines += [
+            f"IF octet_length(message) > {max_payload_size} THEN",
+            f"    INSERT INTO {overflow_table} (channel, payload)",
+            f"    VALUES ('{channel}', message)",
+            "    RETURNING id INTO message_id;",
+            f"    message := '{{\"{OVERFLOW_REFERENCE_KEY}\": ' || message_id || '}}';",
+            "END IF;",
+        ]
+    lines += [f"PERFORM pg_notify('{channel}', message);"]
+    return lines
+
+
+def _plpgsql_function(function_name, declarations, body):
+    declare_block = "\n".join(" " * 8 + line for line in declarations)
+    body_block = "\n".join(" " * 8 + line for line in body)
+    return f"""
+    CREATE OR REPLACE FUNCTION {function_name}()
+    RETURNS TRIGGER AS $$
+    DECLARE
+{declare_block}
+    BEGIN
+{body_block}
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+
+NEW_TRANSITION_TABLE = "new_rows"
+
+OLD_TRANSITION_TABLE = "old_rows"
+
+
+def _statement_rows_section(relation, chunk_size, summary_key, notify, max_payload_size):
+    # Notifies the rows of one transition table, in chunks or as a summary
+    header = [
+        "'trigger', TG_NAME,",
+        "'timing', TG_WHEN,",
+        "'event', TG_OP,",
+        "'table', TG_TABLE_NAME,",
+    ]
+    if summary_key is not None:
+        lines = ["SELECT json_build_object("]
+        lines += ["    " + line for line in header]
+        lines += [
+            "    'count', count(*),",
+            f"    'min_key', min({summary_key}),",
+            f"    'max_key', max({summary_key})",
+            f")::text, count(*) INTO message, row_count FROM {relation};",
+            "IF row_count > 0 THEN",
+        ]
+        lines += ["    " + line for line in notify]
+        lines += ["END IF;"]
+        return lines
+
+    # A chunk is sent once it holds chunk_size rows or the next row would take the
+    # message over max_payload_size bytes; only a single oversized row can exceed it
+    build = ["message := json_build_object("]
+    build += ["    " + line for line in header]
+    build += [
+        "    'chunk', chunk,",
+        "    'rows', ('[' || rows_text || ']')::json",
+        ")::text;",
+    ]
+    measure = ["SELECT octet_length(json_build_object("]
+    measure += ["    " + line for line in header]
+    measure += [
+        "    'chunk', chunk,",
+        "    'rows', '[]'::json",
+        ")::text) INTO envelope_size;",
+    ]
+    next_chunk = ["chunk := chunk + 1;", "row_count := 0;", "rows_text := '';"]
+
+    lines = ["chunk := 0;", "row_count := 0;", "rows_text := '';"]
+    lines += measure
+    lines += [f"FOR row_data IN SELECT to_jsonb(r)::text FROM {relation} AS r LOOP"]
+    lines += [
+        f"    IF row_count >= {chunk_size} OR (row_count > 0 AND envelope_size",
+        f"        + octet_length(rows_text) + 1 + octet_length(row_data) > {max_payload_size}) THEN",
+    ]
+    lines += ["        " + line for line in build + notify + next_chunk + measure]
+    lines += [
+        "    END IF;",
+        "    IF row_count > 0 THEN",
+        "        rows_text := rows_text || ',';",
+        "    END IF;",
+        "    rows_text := rows_text || row_data;",
+        "    row_count := row_count + 1;",
+        "END LOOP;",
+        "IF row_count > 0 THEN",
+    ]
+    lines += ["    " + line for line in build + notify]
+    lines += ["END IF;"]
+    return lines
+
+
+def create_statement_trigger_function_query(
+    function_name,
+    channel,
+    chunk_size=100,
+    summary_key=None,
+    overflow_table=None,
+    max_payload_size=MAX_NOTIFY_PAYLOAD_SIZE,
+    outbox_table=None,
+):
+    declarations = ["message TEXT;", "row_count BIGINT;"]
+    if summary_key is None:
+        declarations += [
+            "row_data TEXT;",
+            "rows_text TEXT;",
+            "chunk INTEGER;",
+            "envelope_size INTEGER;",
+        ]
+    if overflow_table is not None:
+        declarations.append("message_id BIGINT;")
+
+    notify = _notify_section(channel, overflow_table, max_payload_size, outbox_table)
+    body = ["IF TG_OP = 'DELETE' THEN"]
+    body += [
+        "    " + line
+        for line in _statement_rows_section(
+            OLD_TRANSITION_TABLE, chunk_size, summary_key, notify, max_payload_size
+        )
+    ]
+    body += ["ELSE"]
+    body += [
+        "    " + line
+        for line in _statement_rows_section(
+            NEW_TRANSITION_TABLE, chunk_size, summary_key, notify, max_payload_size
+        )
+    ]
+    body += ["END IF;", "RETURN NULL;"]
+    return _plpgsql_function(function_name, declarations, body)
+
+
+def create_overflow_table_query(table_name):
+    return f"""
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        id BIGSERIAL PRIMARY KEY,
+        channel TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    """
+
+
+def fetch_overflow_payloads_query(table_name):
+    return f"SELECT id, payload FROM {table_name} WHERE id = ANY($1::bigint[]);"
+
+
+def purge_overflow_payloads_query(table_name):
+    return f"DELETE FROM {table_name} WHERE created_at < now() - make_interval(secs => $1);"
+
+
+def _table_oid(name):
+    # Schema-qualified names are parsed as SQL identifiers; bare names match relname
+    # exactly, case included, and are resolved through the search path
+    return (
+        f"to_regclass(CASE WHEN strpos({name}, '.') > 0 "
+        f"THEN {name} ELSE quote_ident({name}) END)"
+    )
 
-GET_TRIGGER_FUNCTIONS_QUERY = """
+
+GET_TRIGGER_FUNCTIONS_QUERY = f"""
 SELECT pg_proc.proname AS function_name
 FROM pg_trigger
-INNER JOIN pg_class ON pg_class.oid = tgrelid
-INNER JOIN pg_proc ON pg_proc.oid = tgfoid
-WHERE pg_class.relname = $1
-  AND NOT tgisinternal
+INNER JOIN pg_proc ON pg_proc.oid = pg_trigger.tgfoid
+WHERE pg_trigger.tgrelid = {_table_oid("$1")}
+  AND NOT pg_trigger.tgisinternal
+"""
+
+GET_TRIGGER_FUNCTIONS_MANY_QUERY = f"""
+SELECT s.table_name, pg_proc.proname AS function_name
+FROM unnest($1::text[]) AS s(table_name)
+INNER JOIN pg_trigger ON pg_trigger.tgrelid = {_table_oid("s.table_name")}
+INNER JOIN pg_proc ON pg_proc.oid = pg_trigger.tgfoid
+WHERE NOT pg_trigger.tgisinternal
+ORDER BY s.table_name, pg_trigger.tgname;
+"""
+
+GET_TRIGGERS_QUERY = f"""
+SELECT pg_trigger.tgname AS trigger_name
+FROM pg_trigger
+WHERE pg_trigger.tgrelid = {_table_oid("$1")}
+  AND NOT pg_trigger.tgisinternal
+ORDER BY pg_trigger.tgname;
 """
 
-GET_TRIGGERS_QUERY = """
-SELECT trigger_name
-FROM information_schema.triggers
-WHERE event_object_table = $1
-GROUP BY trigger_name
-ORDER BY trigger_name;
+GET_TRIGGERS_MANY_QUERY = f"""
+SELECT s.table_name, pg_trigger.tgname AS trigger_name
+FROM unnest($1::text[]) AS s(table_name)
+INNER JOIN pg_trigger ON pg_trigger.tgrelid = {_table_oid("s.table_name")}
+WHERE NOT pg_trigger.tgisinternal
+ORDER BY s.table_name, pg_trigger.tgname;
 """
 
+GET_FUNCTION_SOURCES_QUERY = """
+SELECT s.function_name, pg_proc.prosrc AS source
+FROM unnest($1::text[]) AS s(function_name)
+INNER JOIN pg_proc ON pg_proc.oid = to_regprocedure(s.function_name || '()');
+"""
+
+GET_TRIGGER_DEFINITIONS_QUERY = """
+SELECT s.table_name,
+       s.trigger_name,
+       pg_trigger.tgfoid = to_regprocedure(s.function_name || '()') AS same_function,
+       pg_trigger.tgtype AS trigger_type,
+       pg_trigger.tgoldtable AS old_table,
+       pg_trigger.tgnewtable AS new_table
+FROM unnest($1::text[], $2::text[], $3::text[]) AS s(table_name, trigger_name, function_name)
+INNER JOIN pg_trigger
+        ON pg_trigger.tgrelid = to_regclass(s.table_name)
+       AND pg_trigger.tgname = s.trigger_name
+WHERE NOT pg_trigger.tgisinternal;
+"""
+
+# Bits of pg_trigger.tgtype
+_TRIGGER_TYPE_BITS = {
+    "ROW": 1,
+    "BEFORE": 2,
+    "INSERT": 4,
+    "DELETE": 8,
+    "UPDATE": 16,
+}
+
+
+def trigger_type(event, timing, level="ROW"):
+    # The pg_trigger.tgtype of a trigger created by create_trigger_query
+    return (
+        _TRIGGER_TYPE_BITS[event]
+        | _TRIGGER_TYPE_BITS.get(timing, 0)
+        | _TRIGGER_TYPE_BITS.get(level, 0)
+    )
+
+
+def trigger_transition_tables(event, level="ROW"):
+    # The (tgoldtable, tgnewtable) of a trigger created by create_trigger_query
+    if level == "ROW":
+        return None, None
+    return (
+        OLD_TRANSITION_TABLE if event in ("UPDATE", "DELETE") else None,
+        NEW_TRANSITION_TABLE if event in ("INSERT", "UPDATE") else None,
+    )
+
+
+def function_source(query):
+    # The body of a CREATE FUNCTION query, as stored in pg_proc.prosrc
+    return query.split("$$")[1]
+
 
 def drop_function_query(function_name):
     return f"DROP FUNCTION IF EXISTS {function_name} CASCADE;"
 
 
-def create_trigger_query(table_name, trigger_name, function_name, event, timing):
+def create_outbox_table_query(table_name):
+    return f"""
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        id BIGSERIAL PRIMARY KEY,
+        txid BIGINT NOT NULL DEFAULT txid_current(),
+        channel TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS {table_name}_channel_position_idx
+        ON {table_name} (channel, txid, id);
+    CREATE TABLE IF NOT EXISTS {table_name}_offsets (
+        consumer TEXT NOT NULL,
+        channel TEXT NOT NULL,
+        txid BIGINT NOT NULL,
+        id BIGINT NOT NULL,
+        PRIMARY KEY (consumer, channel)
+    );
+    """
+
+
+def outbox_notify_query(table_name):
+    return f"""
+    WITH appended AS (
+        INSERT INTO {table_name} (channel, payload) VALUES ($1, $2)
+    )
+    SELECT pg_notify($1, '');
+    """
+
+
+def outbox_notify_many_query(table_name):
+    return f"""
+    WITH appended AS (
+        INSERT INTO {table_name} (channel, payload)
+        SELECT * FROM unnest($1::text[], $2::text[])
+    )
+    SELECT pg_notify(channel, '')
+    FROM (SELECT DISTINCT unnest($1::text[]) AS channel) AS channels;
+    """
+
+
+def fetch_outbox_query(table_name):
+    # Rows are read in (txid, id) order and only once every transaction that could
+    # still add an earlier row has finished, so the position never skips a row.
+    return f"""
+    SELECT txid, id, payload
+    FROM {table_name}
+    WHERE channel = $1
+      AND (txid, id) > ($2, $3)
+      AND txid < txid_snapshot_xmin(txid_current_snapshot())
+    ORDER BY txid, id
+    LIMIT $4;
+    """
+
+
+def load_outbox_offset_query(table_name):
+    return f"SELECT txid, id FROM {table_name}_offsets WHERE consumer = $1 AND channel = $2;"
+
+
+def save_outbox_offset_query(table_name):
     return f"""
+    INSERT INTO {table_name}_offsets (consumer, channel, txid, id)
+    VALUES ($1, $2, $3, $4)
+    ON CONFLICT (consumer, channel) DO UPDATE SET txid = EXCLUDED.txid, id = EXCLUDED.id;
+    """
+
+
+def purge_outbox_query(table_name):
+    return f"DELETE FROM {table_name} WHERE created_at < now() - make_interval(secs => $1);"
+
+
+def create_trigger_query(
+    table_name, trigger_name, function_name, event, timing, level="ROW"
+):
+    if level == "ROW":
+        return f"""
     CREATE TRIGGER {trigger_name}
     {timing} {event} ON {table_name}
     FOR EACH ROW
     EXECUTE FUNCTION {function_name}();
     """
 
+    transition_tables = {
+        "INSERT": f"NEW TABLE AS {NEW_TRANSITION_TABLE}",
+        "UPDATE": f"OLD TABLE AS {OLD_TRANSITION_TABLE} NEW TABLE AS {NEW_TRANSITION_TABLE}",
+        "DELETE": f"OLD TABLE AS {OLD_TRANSITION_TABLE}",
+    }
+    return f"""
+    CREATE TRIGGER {trigger_name}
+    {timing} {event} ON {table_name}
+    REFERENCING {transition_tables[event]}
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION {function_name}();
+    """
+
 
 def drop_trigger_query(trigger_name, table_name):
     return f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};"
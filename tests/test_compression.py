@@ -0,0 +1,46 @@
+import json
+import random
+import string
+import pytest
+from py_pg_notify.compression import COMPRESSION_MARK, Compressor, decompress
+
+
+class TestCompression:
+    @pytest.fixture
+    def payload(self):
+        return json.dumps({"new": {"id": 1, "description": "lorem ipsum " * 200}})
+
+    def test_round_trip(self, payload):
+        compressed = Compressor(threshold=100).compress(payload)
+
+        assert compressed.startswith(f"{COMPRESSION_MARK}zlib:")
+        assert len(compressed) < len(payload) / 4
+        compressed.encode("ascii")
+        assert decompress(compressed) == payload
+
+    def test_small_payload_unchanged(self):
+        assert Compressor(threshold=100).compress("short") == "short"
+
+    def test_incompressible_payload_unchanged(self):
+        payload = "".join(random.Random(0).choices(string.ascii_letters, k=200))
+        assert Compressor(threshold=0).compress(payload) == payload
+
+    @pytest.mark.parametrize("payload", ["", "message", '{"id": 1}'])
+    def test_decompress_plain_payload(self, payload):
+        assert decompress(payload) == payload
+
+    def test_decompress_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            decompress(f"{COMPRESSION_MARK}lz4:AAAA")
+
+    @pytest.mark.parametrize("kwargs", [{"algorithm": "lz4"}, {"threshold": -1}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            Compressor(**kwargs)
+
+    def test_zstd_round_trip(self, payload):
+        pytest.importorskip("zstandard")
+        compressed = Compressor("zstd", threshold=100).compress(payload)
+
+        assert compressed.startswith(f"{COMPRESSION_MARK}zstd:")
+        assert decompress(compressed) == payload
@@ -0,0 +1,347 @@
+import asyncio
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+from py_pg_notify.dispatcher import (
+    Batcher,
+    Coalescer,
+    Dispatcher,
+    ExecutorDispatcher,
+    is_async_callable,
+    run_in_executor,
+)
+
+
+class _AsyncCallable:
+    async def __call__(self, item):
+        pass
+
+
+@pytest.mark.parametrize(
+    "callback, expected",
+    [
+        (AsyncMock(), True),
+        (_AsyncCallable(), True),
+        (MagicMock(), False),
+        (print, False),
+        (lambda item: item, False),
+    ],
+)
+def test_is_async_callable(callback, expected):
+    assert is_async_callable(callback) is expected
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor():
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="test-pool") as executor:
+        call = run_in_executor(lambda item: (item, threading.current_thread().name), executor)
+        item, thread_name = await call(1)
+
+    assert item == 1
+    assert thread_name.startswith("test-pool")
+
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_awaits_returned_coroutine():
+    async def handle(item, tag):
+        return item, tag
+
+    call = run_in_executor(lambda item: handle(item, "x"))
+
+    assert await call(1) == (1, "x")
+
+@pytest.mark.asyncio
+class TestDispatcher:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"queue_size": 0},
+            {"workers": 0},
+            {"overflow": "unknown"},
+        ],
+    )
+    async def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            Dispatcher(AsyncMock(), **kwargs)
+
+    async def test_delivers_in_order(self):
+        received = []
+
+        async def callback(item):
+            received.append(item)
+
+        dispatcher = Dispatcher(callback, queue_size=10)
+        dispatcher.start()
+        for i in range(5):
+            await dispatcher.put(i)
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert received == [0, 1, 2, 3, 4]
+
+    async def test_drop_newest(self):
+        callback = AsyncMock()
+        dispatcher = Dispatcher(callback, queue_size=2, overflow="drop_newest")
+        for i in range(4):
+            await dispatcher.put(i)
+
+        assert dispatcher.dropped == 2
+        assert list(dispatcher.queue._queue) == [0, 1]
+
+    async def test_drop_oldest(self):
+        callback = AsyncMock()
+        dispatcher = Dispatcher(callback, queue_size=2, overflow="drop_oldest")
+        for i in range(4):
+            await dispatcher.put(i)
+
+        assert dispatcher.dropped == 2
+        assert list(dispatcher.queue._queue) == [2, 3]
+
+    async def test_block_waits_for_space(self):
+        callback = AsyncMock()
+        dispatcher = Dispatcher(callback, queue_size=1, overflow="block")
+        await dispatcher.put(0)
+
+        pending = asyncio.create_task(dispatcher.put(1))
+        await asyncio.sleep(0)
+        assert not pending.done()
+
+        dispatcher.start()
+        await pending
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert callback.await_count == 2
+        assert dispatcher.dropped == 0
+
+    async def test_worker_limit(self):
+        running = 0
+        peak = 0
+
+        async def callback(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        dispatcher = Dispatcher(callback, queue_size=20, workers=3)
+        dispatcher.start()
+        for i in range(10):
+            await dispatcher.put(i)
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert peak == 3
+
+    async def test_callback_error_does_not_stop_worker(self):
+        callback = AsyncMock(side_effect=[Exception("Handler error"), None])
+        dispatcher = Dispatcher(callback, queue_size=10)
+        loop = asyncio.get_running_loop()
+        handler = loop.get_exception_handler()
+        loop.set_exception_handler(lambda loop, context: None)
+        try:
+            dispatcher.start()
+            await dispatcher.put(0)
+            await dispatcher.put(1)
+            await dispatcher.join()
+            await dispatcher.stop()
+        finally:
+            loop.set_exception_handler(handler)
+
+        assert callback.await_count == 2
+
+
+@pytest.mark.asyncio
+class TestBatcher:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"max_batch": 0}, {"max_delay": -1}],
+    )
+    async def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            Batcher(AsyncMock(), **kwargs)
+
+    async def test_flushes_when_full(self):
+        callback = AsyncMock()
+        batcher = Batcher(callback, max_batch=3, max_delay=60)
+        for i in range(7):
+            await batcher.put(i)
+
+        assert [c.args[0] for c in callback.await_args_list] == [[0, 1, 2], [3, 4, 5]]
+        assert batcher.depth == 1
+
+        await batcher.stop()
+        assert callback.await_args.args[0] == [6]
+
+    async def test_flushes_after_delay(self):
+        callback = AsyncMock()
+        batcher = Batcher(callback, max_batch=100, max_delay=0.01)
+        await batcher.put("a")
+        await batcher.put("b")
+        callback.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+        callback.assert_awaited_once_with(["a", "b"])
+        assert batcher.depth == 0
+
+    async def test_stop_without_items(self):
+        callback = AsyncMock()
+        batcher = Batcher(callback)
+        await batcher.stop()
+        callback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestCoalescer:
+    async def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            Coalescer(AsyncMock(), lambda item: item, window=-1)
+
+    async def test_latest_per_key_wins(self):
+        callback = AsyncMock()
+        coalescer = Coalescer(callback, lambda item: item[0], window=60)
+        for item in [("a", 1), ("b", 1), ("a", 2), ("a", 3), ("b", 2), ("c", 1)]:
+            await coalescer.put(item)
+
+        assert coalescer.depth == 3
+        assert coalescer.coalesced == 3
+        await coalescer.flush()
+
+        assert [c.args[0] for c in callback.await_args_list] == [("a", 3), ("b", 2), ("c", 1)]
+        assert coalescer.depth == 0
+
+    async def test_window_closes(self):
+        callback = AsyncMock()
+        coalescer = Coalescer(callback, lambda item: item % 2, window=0.01)
+        for i in range(4):
+            await coalescer.put(i)
+        await asyncio.sleep(0.05)
+
+        assert [c.args[0] for c in callback.await_args_list] == [2, 3]
+
+    async def test_key_error_delivers_immediately(self):
+        callback = AsyncMock()
+        coalescer = Coalescer(callback, lambda item: item["id"], window=60)
+        await coalescer.put({"name": "no id"})
+
+        callback.assert_awaited_once_with({"name": "no id"})
+        assert coalescer.depth == 0
+
+    async def test_stop_flushes(self):
+        callback = AsyncMock()
+        coalescer = Coalescer(callback, lambda item: item, window=60)
+        await coalescer.put(1)
+        await coalescer.stop()
+
+        callback.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+class TestExecutorDispatcher:
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(max_workers=4)
+        yield executor
+        executor.shutdown()
+
+    async def test_invalid_max_pending(self, executor):
+        with pytest.raises(ValueError):
+            ExecutorDispatcher(MagicMock(), executor, max_pending=0)
+
+    async def test_ordered_results(self, executor):
+        first_started = threading.Event()
+        release_first = threading.Event()
+
+        def callback(item):
+            if item == 0:
+                first_started.set()
+                release_first.wait(5)
+            return item * 2
+
+        results = []
+
+        async def result_callback(result):
+            results.append(result)
+            if result == 4:
+                done.set()
+
+        done = asyncio.Event()
+        dispatcher = ExecutorDispatcher(callback, executor, result_callback=result_callback)
+        dispatcher.start()
+        for i in range(3):
+            await dispatcher.put(i)
+        await asyncio.to_thread(first_started.wait, 5)
+        await asyncio.sleep(0.05)
+        # Items 1 and 2 have finished, but item 0 holds back their completion
+        assert results == []
+        release_first.set()
+        await asyncio.wait_for(done.wait(), 5)
+        await dispatcher.stop()
+
+        assert results == [0, 2, 4]
+        assert dispatcher.depth == 0
+
+    async def test_unordered_results(self, executor):
+        release_first = threading.Event()
+
+        def callback(item):
+            if item == 0:
+                release_first.wait(5)
+            return item
+
+        results = []
+        dispatcher = ExecutorDispatcher(
+            callback, executor, ordered=False, result_callback=AsyncMock(side_effect=results.append)
+        )
+        dispatcher.start()
+        for i in range(3):
+            await dispatcher.put(i)
+        while len(results) < 2:
+            await asyncio.sleep(0.01)
+        assert sorted(results) == [1, 2]
+        release_first.set()
+        while len(results) < 3:
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+        assert results[-1] == 0
+
+    async def test_max_pending_blocks(self, executor):
+        release = threading.Event()
+        dispatcher = ExecutorDispatcher(lambda item: release.wait(5), executor, max_pending=1)
+        dispatcher.start()
+        await dispatcher.put(0)
+
+        pending = asyncio.create_task(dispatcher.put(1))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+        assert dispatcher.depth == 1
+
+        release.set()
+        await asyncio.wait_for(pending, 5)
+        await dispatcher.stop()
+
+    async def test_callback_error_is_reported(self, executor):
+        def callback(item):
+            raise ValueError("boom")
+
+        dispatcher = ExecutorDispatcher(callback, executor)
+        dispatcher.start()
+        with patch("py_pg_notify.dispatcher.report_callback_error") as report:
+            await dispatcher.put(0)
+            while dispatcher.depth:
+                await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+        assert isinstance(report.call_args.args[0], ValueError)
+
+    async def test_stop_shuts_down_owned_executor(self):
+        executor = MagicMock()
+        dispatcher = ExecutorDispatcher(MagicMock(), executor, shutdown=True)
+        dispatcher.start()
+        await dispatcher.stop()
+
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
@@ -1,8 +1,16 @@
 import os
+import pickle
+import threading
 import pytest
-from unittest.mock import AsyncMock, patch
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
 from py_pg_notify.listener import Listener, Notification
 from py_pg_notify.pgmanager import PGConfig
+from py_pg_notify.dispatcher import ExecutorDispatcher
+from py_pg_notify.metrics import PrometheusMetrics, stamp
+from py_pg_notify.compression import Compressor
+from py_pg_notify.serializers import Serializer, serialize
 
 
 @pytest.mark.asyncio
@@ -35,6 +43,10 @@ class TestListener:
         assert listener.dsn == expected_dsn
         assert listener.conn is None
 
+    async def test_listener_initialization_with_pool(self, mock_dsn):
+        with pytest.raises(ValueError):
+            Listener(PGConfig(dsn=mock_dsn, use_pool=True))
+
     async def test_listener_initialization_missing_params(self):
         with pytest.raises(ValueError):
             PGConfig(user="user", password="password")  # Missing dbname
@@ -192,3 +204,572 @@ class TestListener:
         # Verify connection call
         mock_connect.assert_called_once_with(config.dsn)
         assert listener.conn == mock_connect.return_value
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_add_listener_with_dispatch_queue(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        callback_mock = AsyncMock()
+        await listener.connect()
+
+        await listener.add_listener(
+            "test_channel", callback_mock, queue_size=10, workers=2, overflow="drop_oldest"
+        )
+        dispatcher = listener.dispatchers["test_channel"]
+        assert dispatcher.workers == 2
+
+        for i in range(3):
+            await listener.listeners["test_channel"](None, 12345, "test_channel", str(i))
+        await dispatcher.join()
+
+        assert [c.args[0].payload for c in callback_mock.await_args_list] == ["0", "1", "2"]
+
+        await listener.remove_listener("test_channel")
+        assert listener.dispatchers == {}
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_add_listener_invalid_overflow(self, mock_connect, mock_config, mock_handler):
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        with pytest.raises(ValueError):
+            await listener.add_listener(
+                "test_channel", mock_handler, queue_size=10, overflow="invalid"
+            )
+        mock_connect.return_value.add_listener.assert_not_called()
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_close_stops_dispatchers(self, mock_connect, mock_config, mock_handler):
+        listener = Listener(mock_config)
+        await listener.connect()
+        await listener.add_listener("test_channel", mock_handler, queue_size=10)
+        tasks = list(listener.dispatchers["test_channel"]._tasks)
+
+        await listener.close()
+        await asyncio.sleep(0)
+
+        assert listener.dispatchers == {}
+        assert all(task.done() for task in tasks)
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_stream_yields_notifications(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        stream = listener.stream("test_channel")
+        first = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0)
+        callback = mock_connect.return_value.add_listener.call_args.args[1]
+        await callback(None, 12345, "test_channel", "first")
+        await callback(None, 12345, "test_channel", "second")
+
+        assert (await first).payload == "first"
+        assert (await stream.__anext__()).payload == "second"
+
+        await stream.aclose()
+        mock_connect.return_value.remove_listener.assert_called_once_with(
+            "test_channel", callback
+        )
+        assert listener.streams == {}
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_stream_batches(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        stream = listener.stream("test_channel", batch_size=2, timeout=0.05)
+        pending = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0)
+        callback = mock_connect.return_value.add_listener.call_args.args[1]
+        for payload in ["1", "2", "3"]:
+            await callback(None, 12345, "test_channel", payload)
+
+        assert [n.payload for n in await pending] == ["1", "2"]
+        # The partial batch is yielded once the timeout expires
+        assert [n.payload for n in await stream.__anext__()] == ["3"]
+        await stream.aclose()
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_stream_ends_on_close(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        async def consume():
+            return [n.payload async for n in listener.stream("test_channel")]
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        callback = mock_connect.return_value.add_listener.call_args.args[1]
+        await callback(None, 12345, "test_channel", "message")
+        await listener.close()
+
+        assert await consumer == ["message"]
+
+    async def test_stream_without_connection(self, mock_config):
+        listener = Listener(mock_config)
+        with pytest.raises(RuntimeError):
+            await listener.stream("test_channel").__anext__()
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_overflow_reference_resolved(self, mock_connect, mock_config):
+        listener = Listener(mock_config, overflow_table="pg_notify_overflow")
+        callback_mock = AsyncMock()
+        await listener.connect()
+        await listener.add_listener("test_channel", callback_mock)
+
+        connection = AsyncMock()
+        connection.fetch.return_value = [{"id": 5, "payload": '{"large": "row"}'}]
+        await listener.listeners["test_channel"](
+            connection, 12345, "test_channel", '{"overflow_id": 5}'
+        )
+
+        assert callback_mock.await_args.args[0].payload == '{"large": "row"}'
+
+    async def test_notification_json_is_lazy_and_cached(self):
+        decoder = MagicMock(return_value={"key": "value"})
+        notification = Notification(None, 12345, "test_channel", '{"key": "value"}', decoder)
+
+        decoder.assert_not_called()
+        assert notification.json == {"key": "value"}
+        assert notification.json == {"key": "value"}
+        decoder.assert_called_once_with('{"key": "value"}')
+
+    async def test_notification_default_decoder(self):
+        notification = Notification(None, 12345, "test_channel", '{"key": [1, 2]}')
+        assert notification.json == {"key": [1, 2]}
+
+    async def test_notification_has_slots(self):
+        notification = Notification(None, 12345, "test_channel", "message")
+        assert not hasattr(notification, "__dict__")
+        with pytest.raises(AttributeError):
+            notification.extra = True
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_listener_decoder(self, mock_connect, mock_config):
+        decoder = MagicMock(return_value={"decoded": True})
+        listener = Listener(mock_config, decoder=decoder)
+        callback_mock = AsyncMock()
+        await listener.connect()
+        await listener.add_listener("test_channel", callback_mock)
+
+        await listener.listeners["test_channel"](None, 12345, "test_channel", "{}")
+
+        assert callback_mock.await_args.args[0].json == {"decoded": True}
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_add_batch_listener(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        callback_mock = AsyncMock()
+        await listener.connect()
+
+        await listener.add_batch_listener(
+            "test_channel", callback_mock, max_batch=2, max_delay_ms=10000
+        )
+        for payload in ["1", "2", "3"]:
+            await listener.listeners["test_channel"](None, 12345, "test_channel", payload)
+
+        assert [n.payload for n in callback_mock.await_args.args[0]] == ["1", "2"]
+
+        # Removing the listener delivers the pending partial batch
+        await listener.remove_listener("test_channel")
+        assert [n.payload for n in callback_mock.await_args.args[0]] == ["3"]
+        assert callback_mock.await_count == 2
+
+    async def test_add_batch_listener_without_connection(self, mock_config, mock_handler):
+        listener = Listener(mock_config)
+        with pytest.raises(RuntimeError):
+            await listener.add_batch_listener("test_channel", mock_handler)
+
+    @pytest.fixture
+    def reconnect_connections(self):
+        def make():
+            conn = AsyncMock()
+            conn.add_termination_listener = MagicMock()
+            conn.terminate = MagicMock()
+            return conn
+
+        return make
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_reconnect_relistens_channels(
+        self, mock_connect, mock_config, mock_handler, reconnect_connections
+    ):
+        first, second = reconnect_connections(), reconnect_connections()
+        mock_connect.side_effect = [first, second]
+        listener = Listener(mock_config, reconnect=True, reconnect_delay=0.001)
+        await listener.connect()
+        await listener.add_listener("channel_1", mock_handler)
+        await listener.add_listener("channel_2", mock_handler)
+
+        on_lost = first.add_termination_listener.call_args.args[0]
+        on_lost(first)
+        assert listener.conn is None
+        await listener._reconnect_task
+
+        assert listener.conn is second
+        assert listener.reconnects == 1
+        second.add_listener.assert_any_await("channel_1", listener.listeners["channel_1"])
+        second.add_listener.assert_any_await("channel_2", listener.listeners["channel_2"])
+        second.add_termination_listener.assert_called_once_with(on_lost)
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_reconnect_backoff(
+        self, mock_connect, mock_sleep, mock_config, reconnect_connections
+    ):
+        first, second = reconnect_connections(), reconnect_connections()
+        mock_connect.side_effect = [first, OSError("refused"), OSError("refused"), second]
+        listener = Listener(
+            mock_config, reconnect=True, reconnect_delay=1, reconnect_max_delay=1.5
+        )
+        await listener.connect()
+
+        with patch("random.uniform", side_effect=lambda low, high: high):
+            listener._on_connection_lost(first)
+            await listener._reconnect_task
+
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [1, 1.5]
+        assert listener.conn is second
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_close_ignores_own_termination(
+        self, mock_connect, mock_config, reconnect_connections
+    ):
+        conn = reconnect_connections()
+        mock_connect.return_value = conn
+        listener = Listener(mock_config, reconnect=True)
+        await listener.connect()
+        await listener.close()
+
+        listener._on_connection_lost(conn)
+        assert listener._reconnect_task is None
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_add_outbox_listener(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        mock_conn.fetch.side_effect = [
+            [{"txid": 10, "id": 1, "payload": "event 1"}],
+            [{"txid": 10, "id": 2, "payload": "event 2"}],
+        ]
+        metrics = PrometheusMetrics()
+        listener = Listener(mock_config, metrics=metrics)
+        callback_mock = AsyncMock()
+        await listener.connect()
+
+        await listener.add_outbox_listener("test_channel", callback_mock, "outbox")
+        await asyncio.sleep(0.01)
+        assert callback_mock.await_args.args[0].payload == "event 1"
+
+        # A wake-up NOTIFY reads the rows after the watermark
+        await listener.listeners["test_channel"](None, 12345, "test_channel", "")
+        await asyncio.sleep(0.01)
+        assert callback_mock.await_args.args[0].payload == "event 2"
+        assert mock_conn.fetch.await_args.args[1:4] == ("test_channel", 10, 1)
+        # Delivered rows are counted, wake-ups are not
+        assert metrics.counters[("received", "test_channel")] == 2
+
+        await listener.close()
+        assert listener.dispatchers == {}
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_pattern_listener_syncs_listens(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        callback_mock = AsyncMock()
+        await listener.connect()
+
+        await listener.listen("orders.eu.1", "orders.us.1", "inventory")
+        # No pattern yet, so nothing is listened to on the server
+        mock_conn.add_listener.assert_not_called()
+
+        await listener.add_pattern_listener("orders.eu.*", callback_mock)
+        mock_conn.add_listener.assert_called_once_with("orders.eu.1", listener._route)
+        assert listener.routed_channels == {"orders.eu.1"}
+
+        await listener._route(None, 12345, "orders.eu.1", "message")
+        assert callback_mock.await_args.args[0].channel == "orders.eu.1"
+
+        await listener.remove_pattern_listener("orders.eu.*")
+        mock_conn.remove_listener.assert_called_once_with("orders.eu.1", listener._route)
+        assert listener.routed_channels == set()
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_pattern_listener_new_channel(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        await listener.add_pattern_listener("orders.**", AsyncMock())
+        await listener.listen("orders.eu.7")
+        mock_conn.add_listener.assert_called_once_with("orders.eu.7", listener._route)
+
+        await listener.unlisten("orders.eu.7")
+        mock_conn.remove_listener.assert_called_once_with("orders.eu.7", listener._route)
+
+    async def test_pattern_listener_without_connection(self, mock_config, mock_handler):
+        listener = Listener(mock_config)
+        with pytest.raises(RuntimeError):
+            await listener.add_pattern_listener("orders.*", mock_handler)
+
+    async def test_notification_pickles_without_connection(self):
+        notification = Notification(object(), 12345, "test_channel", '{"a": 1}')
+        copy = pickle.loads(pickle.dumps(notification))
+        assert copy.connection is None
+        assert (copy.pid, copy.channel, copy.json) == (12345, "test_channel", {"a": 1})
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_add_process_listener(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        results = []
+        done = asyncio.Event()
+
+        async def result_callback(result):
+            results.append(result)
+            done.set()
+
+        await listener.add_process_listener(
+            "test_channel", _payload_length, processes=1, result_callback=result_callback
+        )
+        assert isinstance(listener.dispatchers["test_channel"], ExecutorDispatcher)
+
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        await wrapped_callback(mock_conn, 12345, "test_channel", "message")
+        await asyncio.wait_for(done.wait(), 30)
+        await listener.close()
+
+        assert results == [len("message")]
+
+    async def test_add_process_listener_without_connection(self, mock_config):
+        listener = Listener(mock_config)
+        with pytest.raises(RuntimeError):
+            await listener.add_process_listener("test_channel", _payload_length)
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_sync_callback_runs_in_thread_pool(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config, max_threads=2)
+        await listener.connect()
+
+        threads = []
+        done = threading.Event()
+
+        def callback(notification):
+            threads.append(threading.current_thread().name)
+            done.set()
+
+        await listener.add_listener("test_channel", callback)
+        assert listener.dispatchers["test_channel"].queue.maxsize == 1000
+
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        await wrapped_callback(mock_conn, 12345, "test_channel", "message")
+        await asyncio.to_thread(done.wait, 5)
+        await listener.close()
+
+        assert threads[0].startswith("py-pg-notify")
+        assert listener.executor is None
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_sync_callback_custom_executor(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        callback = MagicMock()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            await listener.add_listener("test_channel", callback, executor=executor, workers=2)
+            dispatcher = listener.dispatchers["test_channel"]
+            assert dispatcher.workers == 2
+
+            wrapped_callback = mock_conn.add_listener.call_args.args[1]
+            await wrapped_callback(mock_conn, 12345, "test_channel", "message")
+            await dispatcher.join()
+            await listener.close()
+
+        assert callback.call_args.args[0].payload == "message"
+        # The shared pool is only created when needed
+        assert listener.executor is None
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_sync_batch_callback_runs_in_thread_pool(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        await listener.connect()
+        calls = []
+
+        def callback(notifications):
+            calls.append(([n.payload for n in notifications], threading.current_thread().name))
+
+        await listener.add_batch_listener("test_channel", callback, max_batch=2)
+        for payload in ["1", "2"]:
+            await listener.listeners["test_channel"](None, 12345, "test_channel", payload)
+        await listener.close()
+
+        assert calls[0][0] == ["1", "2"]
+        assert calls[0][1].startswith("py-pg-notify")
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_sync_coalescing_callback_runs_in_thread_pool(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        await listener.connect()
+        calls = []
+
+        def callback(notification):
+            calls.append((notification.json["id"], threading.current_thread().name))
+
+        await listener.add_coalescing_listener("test_channel", callback, key="id", window_ms=1)
+        for payload in ['{"id": 1}', '{"id": 1}']:
+            await listener.listeners["test_channel"](None, 12345, "test_channel", payload)
+        await asyncio.sleep(0.05)
+        await listener.close()
+
+        assert len(calls) == 1
+        assert calls[0][0] == 1 and calls[0][1].startswith("py-pg-notify")
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_sync_pattern_callback_runs_in_thread_pool(self, mock_connect, mock_config):
+        listener = Listener(mock_config)
+        await listener.connect()
+        calls = []
+
+        def callback(notification):
+            calls.append((notification.channel, threading.current_thread().name))
+
+        await listener.listen("orders.eu.1")
+        await listener.add_pattern_listener("orders.*.*", callback)
+        await listener._route(None, 12345, "orders.eu.1", "message")
+        await listener.close()
+
+        assert calls[0][0] == "orders.eu.1"
+        assert calls[0][1].startswith("py-pg-notify")
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_lambda_returning_coroutine(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        await listener.connect()
+
+        received = []
+
+        async def handle(notification, tag):
+            received.append((notification.payload, tag))
+
+        await listener.add_listener("test_channel", lambda n: handle(n, "x"))
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        await wrapped_callback(mock_conn, 12345, "test_channel", "message")
+        await listener.dispatchers["test_channel"].join()
+        await listener.close()
+
+        assert received == [("message", "x")]
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_add_coalescing_listener(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        callback_mock = AsyncMock()
+        await listener.connect()
+
+        await listener.add_coalescing_listener(
+            "test_channel", callback_mock, key="new.product_id", window_ms=60_000
+        )
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        for product_id, stock in [(1, 10), (2, 5), (1, 9), (1, 8)]:
+            payload = f'{{"new": {{"product_id": {product_id}, "stock": {stock}}}}}'
+            await wrapped_callback(mock_conn, 12345, "test_channel", payload)
+        await listener.close()
+
+        delivered = [c.args[0].json["new"] for c in callback_mock.await_args_list]
+        assert delivered == [{"product_id": 1, "stock": 8}, {"product_id": 2, "stock": 5}]
+
+    async def test_add_coalescing_listener_without_connection(self, mock_config, mock_handler):
+        listener = Listener(mock_config)
+        with pytest.raises(RuntimeError):
+            await listener.add_coalescing_listener("test_channel", mock_handler, key="id")
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_listener_metrics(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        metrics = PrometheusMetrics()
+        listener = Listener(mock_config, metrics=metrics)
+        # A handler returning False must not be counted as a dropped notification
+        callback_mock = AsyncMock(side_effect=[False, ValueError("boom")])
+        await listener.connect()
+
+        await listener.add_listener("test_channel", callback_mock)
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        await wrapped_callback(mock_conn, 12345, "test_channel", stamp("message"))
+        with pytest.raises(ValueError):
+            await wrapped_callback(mock_conn, 12345, "test_channel", "message")
+
+        # The send timestamp is removed before delivery
+        assert callback_mock.await_args_list[0].args[0].payload == "message"
+        assert metrics.counters[("received", "test_channel")] == 2
+        assert metrics.counters[("errors", "test_channel")] == 1
+        assert ("dropped", "test_channel") not in metrics.counters
+        assert metrics.histograms[("handler_seconds", "test_channel")].count == 2
+        assert metrics.histograms[("latency_seconds", "test_channel")].count == 1
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_listener_metrics_queue(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        metrics = PrometheusMetrics()
+        listener = Listener(mock_config, metrics=metrics)
+        await listener.connect()
+
+        await listener.add_listener(
+            "test_channel", AsyncMock(), queue_size=1, overflow="drop_newest"
+        )
+        await listener.dispatchers["test_channel"].stop()
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        for _ in range(3):
+            await wrapped_callback(mock_conn, 12345, "test_channel", "message")
+
+        assert 'pg_notify_queue_depth{channel="test_channel"} 1' in metrics.render()
+        assert metrics.counters[("dropped", "test_channel")] == 2
+
+        await listener.close()
+        assert metrics.gauges == {}
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_compressed_payload_decompressed(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+        listener = Listener(mock_config)
+        callback_mock = AsyncMock()
+        await listener.connect()
+
+        payload = '{"description": "' + "lorem ipsum " * 100 + '"}'
+        compressed = stamp(Compressor(threshold=0).compress(payload))
+        await listener.add_listener("test_channel", callback_mock)
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        await wrapped_callback(mock_conn, 12345, "test_channel", compressed)
+
+        assert callback_mock.await_args.args[0].payload == payload
+
+    @patch("asyncpg.connect", new_callable=AsyncMock)
+    async def test_enveloped_payload_decoded(self, mock_connect, mock_config):
+        mock_conn = mock_connect.return_value
+
+        class ReprSerializer(Serializer):
+            name = "repr"
+            envelope = True
+
+            def dumps(self, obj):
+                return repr(obj)
+
+            def loads(self, text):
+                return eval(text)
+
+        listener = Listener(mock_config, serializers=[ReprSerializer()])
+        callback_mock = AsyncMock()
+        await listener.connect()
+        await listener.add_listener("test_channel", callback_mock)
+
+        payload = serialize(ReprSerializer(), {"id": (1, 2)})
+        wrapped_callback = mock_conn.add_listener.call_args.args[1]
+        await wrapped_callback(mock_conn, 12345, "test_channel", payload)
+
+        assert callback_mock.await_args.args[0].json == {"id": (1, 2)}
+
+
+def _payload_length(notification):
+    return len(notification.payload)
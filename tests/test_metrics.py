@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import patch
+from py_pg_notify.metrics import (
+    HANDLER_LATENCY,
+    QUEUE_DEPTH,
+    RECEIVED,
+    Metrics,
+    PrometheusMetrics,
+    stamp,
+    unstamp,
+)
+
+
+class TestTimestamps:
+    def test_stamp_round_trip(self):
+        with patch("time.time", return_value=1700000000.25):
+            stamped = stamp('{"id": 1}')
+
+        assert stamped != '{"id": 1}'
+        assert unstamp(stamped) == ('{"id": 1}', 1700000000.25)
+
+    @pytest.mark.parametrize("payload", ["", "message", "\x1emessage", "\x1eabc\x1emessage"])
+    def test_unstamped_payload_unchanged(self, payload):
+        assert unstamp(payload) == (payload, None)
+
+
+class TestPrometheusMetrics:
+    def test_base_metrics_are_no_ops(self):
+        metrics = Metrics()
+        metrics.increment(RECEIVED, "ch_01")
+        metrics.observe(HANDLER_LATENCY, "ch_01", 0.1)
+        metrics.register_gauge(QUEUE_DEPTH, "ch_01", lambda: 1)
+        metrics.unregister_gauge(QUEUE_DEPTH, "ch_01")
+
+    def test_render_empty(self):
+        assert PrometheusMetrics().render() == ""
+
+    def test_render_counters_and_gauges(self):
+        metrics = PrometheusMetrics()
+        metrics.increment(RECEIVED, "ch_01")
+        metrics.increment(RECEIVED, "ch_01", 2)
+        metrics.increment(RECEIVED, 'say "hi"')
+        metrics.register_gauge(QUEUE_DEPTH, "ch_01", lambda: 7)
+
+        lines = metrics.render().splitlines()
+        assert "# TYPE pg_notify_received_total counter" in lines
+        assert 'pg_notify_received_total{channel="ch_01"} 3' in lines
+        assert 'pg_notify_received_total{channel="say \\"hi\\""} 1' in lines
+        assert "# TYPE pg_notify_queue_depth gauge" in lines
+        assert 'pg_notify_queue_depth{channel="ch_01"} 7' in lines
+
+        metrics.unregister_gauge(QUEUE_DEPTH, "ch_01")
+        assert "queue_depth" not in metrics.render()
+
+    def test_render_histogram(self):
+        metrics = PrometheusMetrics(prefix="app", buckets=[0.1, 1.0])
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            metrics.observe(HANDLER_LATENCY, "ch_01", value)
+
+        lines = metrics.render().splitlines()
+        assert "# TYPE app_handler_seconds histogram" in lines
+        assert 'app_handler_seconds_bucket{channel="ch_01",le="0.1"} 2' in lines
+        assert 'app_handler_seconds_bucket{channel="ch_01",le="1.0"} 3' in lines
+        assert 'app_handler_seconds_bucket{channel="ch_01",le="+Inf"} 4' in lines
+        assert 'app_handler_seconds_sum{channel="ch_01"} 2.65' in lines
+        assert 'app_handler_seconds_count{channel="ch_01"} 4' in lines
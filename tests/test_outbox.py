@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from py_pg_notify.outbox import OutboxSubscription
+from py_pg_notify.utils import (
+    fetch_outbox_query,
+    load_outbox_offset_query,
+    save_outbox_offset_query,
+)
+
+
+def outbox_rows(start, count):
+    return [
+        {"txid": 100, "id": i, "payload": f"event {i}"}
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.mark.asyncio
+class TestOutboxSubscription:
+    @pytest.fixture
+    def fake_outbox(self):
+        # Serves outbox pages after the requested (txid, id) position
+        rows = outbox_rows(1, 5)
+        saved = []
+
+        async def fetch(query, *args):
+            if query == fetch_outbox_query("outbox"):
+                channel, txid, row_id, limit = args
+                after = [r for r in rows if (r["txid"], r["id"]) > (txid, row_id)]
+                return after[:limit]
+            if query == save_outbox_offset_query("outbox"):
+                saved.append(args)
+                return []
+            if query == load_outbox_offset_query("outbox"):
+                return [{"txid": 100, "id": 3}]
+            raise AssertionError(query)
+
+        return AsyncMock(side_effect=fetch), saved
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"batch_size": 0}, {"poll_interval": 0}],
+    )
+    async def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            OutboxSubscription("ch_01", AsyncMock(), AsyncMock(), "outbox", **kwargs)
+
+    async def test_catch_up_in_pages(self, fake_outbox):
+        fetch, saved = fake_outbox
+        callback = AsyncMock()
+        subscription = OutboxSubscription(
+            "ch_01", callback, fetch, "outbox", batch_size=2
+        )
+
+        await subscription.catch_up()
+
+        assert [c.args[0] for c in callback.await_args_list] == [
+            f"event {i}" for i in range(1, 6)
+        ]
+        assert subscription.watermark == (100, 5)
+        # Three pages of at most two rows are read
+        assert fetch.await_count == 3
+        assert saved == []
+
+    async def test_catch_up_after_position(self, fake_outbox):
+        fetch, _ = fake_outbox
+        callback = AsyncMock()
+        subscription = OutboxSubscription(
+            "ch_01", callback, fetch, "outbox", after=(100, 4)
+        )
+
+        await subscription.catch_up()
+
+        callback.assert_awaited_once_with("event 5")
+
+    async def test_consumer_resumes_and_persists(self, fake_outbox):
+        fetch, saved = fake_outbox
+        callback = AsyncMock()
+        subscription = OutboxSubscription(
+            "ch_01", callback, fetch, "outbox", consumer="worker", batch_size=10
+        )
+
+        subscription.start()
+        await asyncio.sleep(0.01)
+        await subscription.stop()
+
+        assert [c.args[0] for c in callback.await_args_list] == ["event 4", "event 5"]
+        assert saved == [("worker", "ch_01", 100, 5)]
+
+    async def test_failed_callback_keeps_position(self, fake_outbox):
+        fetch, saved = fake_outbox
+        callback = AsyncMock(side_effect=[None, Exception("Handler error")])
+        subscription = OutboxSubscription(
+            "ch_01", callback, fetch, "outbox", consumer="worker"
+        )
+
+        with pytest.raises(Exception, match="Handler error"):
+            await subscription.catch_up()
+
+        assert subscription.watermark == (100, 1)
+        assert saved == [("worker", "ch_01", 100, 1)]
+
+    async def test_wake_up_triggers_catch_up(self, fake_outbox):
+        fetch, _ = fake_outbox
+        callback = AsyncMock()
+        subscription = OutboxSubscription("ch_01", callback, fetch, "outbox")
+
+        subscription.start()
+        await asyncio.sleep(0.01)
+        assert callback.await_count == 5
+
+        await subscription.put(None)
+        await asyncio.sleep(0.01)
+        await subscription.stop()
+
+        # The second catch-up finds nothing new after the watermark
+        assert callback.await_count == 5
+        assert fetch.await_count == 2
+
+    async def test_poll_reads_held_back_rows(self):
+        # The first read finds the row held back by an older open transaction
+        fetch = AsyncMock(side_effect=[[], outbox_rows(1, 1)] + [[]] * 100)
+        callback = AsyncMock()
+        subscription = OutboxSubscription("ch_01", callback, fetch, "outbox", poll_interval=0.01)
+        assert OutboxSubscription("ch_01", callback, fetch, "outbox").poll_interval == 1.0
+
+        subscription.start()
+        await asyncio.sleep(0.05)
+        await subscription.stop()
+
+        # Delivered by a poll, without a second wake-up
+        callback.assert_awaited_once_with("event 1")
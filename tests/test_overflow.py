@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from py_pg_notify.overflow import OverflowResolver, overflow_reference
+from py_pg_notify.utils import fetch_overflow_payloads_query
+
+
+@pytest.mark.asyncio
+class TestOverflowResolver:
+    @pytest.mark.parametrize(
+        "payload, expected",
+        [
+            ('{"overflow_id": 42}', 42),
+            ('{"trigger": "t", "event": "INSERT"}', None),
+            ('{"overflow_id": "not a number"}', None),
+            ("plain message", None),
+        ],
+    )
+    async def test_overflow_reference(self, payload, expected):
+        assert overflow_reference(payload) == expected
+
+    async def test_regular_payload_is_unchanged(self):
+        connection = AsyncMock()
+        resolver = OverflowResolver("pg_notify_overflow")
+
+        assert await resolver.resolve(connection, "message") == "message"
+        connection.fetch.assert_not_called()
+
+    async def test_resolves_reference(self):
+        connection = AsyncMock()
+        connection.fetch.return_value = [{"id": 7, "payload": '{"big": "row"}'}]
+        resolver = OverflowResolver("pg_notify_overflow")
+
+        payload = await resolver.resolve(connection, '{"overflow_id": 7}')
+
+        assert payload == '{"big": "row"}'
+        connection.fetch.assert_awaited_once_with(
+            fetch_overflow_payloads_query("pg_notify_overflow"), [7]
+        )
+
+    async def test_concurrent_references_are_batched(self):
+        connection = AsyncMock()
+        release = asyncio.Event()
+
+        async def fetch(query, ids):
+            await release.wait()
+            return [{"id": i, "payload": f"payload {i}"} for i in ids]
+
+        connection.fetch.side_effect = fetch
+        resolver = OverflowResolver("pg_notify_overflow")
+
+        tasks = [
+            asyncio.create_task(resolver.resolve(connection, f'{{"overflow_id": {i}}}'))
+            for i in range(1, 5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert results == [f"payload {i}" for i in range(1, 5)]
+        # The first lookup holds id 1, the others are resolved together
+        assert [c.args[1] for c in connection.fetch.await_args_list] == [[1], [2, 3, 4]]
+
+    async def test_missing_row(self):
+        connection = AsyncMock()
+        connection.fetch.return_value = []
+        resolver = OverflowResolver("pg_notify_overflow")
+
+        with pytest.raises(KeyError, match="Overflow payload 3 not found"):
+            await resolver.resolve(connection, '{"overflow_id": 3}')
@@ -0,0 +1,49 @@
+import pytest
+from py_pg_notify.router import Router
+
+
+class TestRouter:
+    @pytest.fixture
+    def router(self):
+        router = Router()
+        router.add("orders.eu.*", "eu_orders")
+        router.add("orders.**", "all_orders")
+        router.add("orders.*.42", "order_42")
+        router.add("inventory", "inventory")
+        return router
+
+    @pytest.mark.parametrize(
+        "channel, expected",
+        [
+            ("orders.eu.123", {"eu_orders", "all_orders"}),
+            ("orders.us.42", {"all_orders", "order_42"}),
+            ("orders.eu.42", {"eu_orders", "all_orders", "order_42"}),
+            ("orders", {"all_orders"}),
+            ("orders.eu.123.items", {"all_orders"}),
+            ("inventory", {"inventory"}),
+            ("inventory.1", set()),
+            ("customers.eu.1", set()),
+        ],
+    )
+    def test_match(self, router, channel, expected):
+        assert set(router.match(channel)) == expected
+
+    @pytest.mark.parametrize("pattern", ["", "orders..eu", "orders.**.eu"])
+    def test_invalid_pattern(self, pattern):
+        with pytest.raises(ValueError):
+            Router().add(pattern, "handler")
+
+    def test_remove(self, router):
+        assert set(router.match("orders.eu.1")) == {"eu_orders", "all_orders"}
+        router.remove("orders.**")
+        assert router.match("orders.eu.1") == ["eu_orders"]
+        assert "orders.**" not in router.patterns
+
+    def test_remove_unknown_pattern(self, router):
+        with pytest.raises(KeyError):
+            router.remove("customers.*")
+
+    def test_literal_wildcard_channel_matches_once(self):
+        router = Router()
+        router.add("orders.*", "handler")
+        assert router.match("orders.*") == ["handler"]
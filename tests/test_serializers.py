@@ -0,0 +1,75 @@
+import pickle
+import pytest
+from py_pg_notify.serializers import (
+    SERIALIZER_MARK,
+    JSONSerializer,
+    OrjsonSerializer,
+    PayloadDecoder,
+    Serializer,
+    get_serializer,
+    serialize,
+)
+
+
+class ReprSerializer(Serializer):
+    name = "repr"
+    envelope = True
+
+    def dumps(self, obj):
+        return repr(obj)
+
+    def loads(self, text):
+        return eval(text)
+
+
+class TestSerializers:
+    @pytest.fixture
+    def obj(self):
+        return {"id": 1, "tags": ["a", "b"], "price": 9.5, "active": True}
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    def test_round_trip(self, name, obj):
+        pytest.importorskip(name)
+        serializer = get_serializer(name)
+        payload = serialize(serializer, obj)
+
+        assert isinstance(payload, str)
+        assert payload.startswith(SERIALIZER_MARK) == serializer.envelope
+        assert PayloadDecoder()(payload) == obj
+
+    def test_json_payload_has_no_header(self, obj):
+        assert serialize(JSONSerializer(), obj) == '{"id":1,"tags":["a","b"],"price":9.5,"active":true}'
+
+    def test_strings_are_sent_unchanged(self):
+        assert serialize(ReprSerializer(), "plain text") == "plain text"
+
+    def test_unknown_serializer(self):
+        with pytest.raises(ValueError):
+            get_serializer("yaml")
+
+    def test_incomplete_serializer_fails_on_construction(self):
+        class DumpsOnly(Serializer):
+            name = "dumps-only"
+
+            def dumps(self, obj):
+                return repr(obj)
+
+        with pytest.raises(TypeError):
+            DumpsOnly()
+
+    def test_instance_passed_through(self):
+        serializer = ReprSerializer()
+        assert get_serializer(serializer) is serializer
+
+    def test_custom_serializer_envelope(self, obj):
+        payload = serialize(ReprSerializer(), obj)
+
+        assert payload.startswith(f"{SERIALIZER_MARK}repr:")
+        assert PayloadDecoder(serializers=[ReprSerializer()])(payload) == obj
+        with pytest.raises(ValueError):
+            PayloadDecoder()(payload)
+
+    def test_payload_decoder_pickles(self, obj):
+        pytest.importorskip("orjson")
+        decoder = pickle.loads(pickle.dumps(PayloadDecoder(serializers=[OrjsonSerializer()])))
+        assert decoder(serialize(JSONSerializer(), obj)) == obj